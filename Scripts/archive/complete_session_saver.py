@@ -1,66 +1,59 @@
 from selenium import webdriver
 import pickle
 import json
+import sys
 import time
 import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-SESSION_DIR = BASE_DIR / "data" / "sessions"
+SCRIPTS_DIR = Path(__file__).parent.parent
+
+# Snapshot format and location are shared with the main app
+sys.path.insert(0, str(SCRIPTS_DIR))
+from deskagent_v1 import SESSION_PATH, SessionSnapshot
+
+SESSION_DIR = SESSION_PATH.parent
 SESSION_DIR.mkdir(parents=True, exist_ok=True)
 
+# Sessions older than this are treated as stale (seconds)
+MAX_SESSION_AGE = 7 * 24 * 3600
+
 def save_complete_session(driver, session_name="whydonate"):
     """Save EVERYTHING needed to restore session"""
     print(f"\n💾 Saving complete session: {session_name}")
     
-    session_data = {
-        'cookies': driver.get_cookies(),
-        'local_storage': {},
-        'session_storage': {},
-        'url': driver.current_url,
-        'title': driver.title
-    }
-    
-    # Save localStorage
-    try:
-        localStorage = driver.execute_script("""
-            var items = {};
-            for (var i = 0; i < localStorage.length; i++) {
-                var key = localStorage.key(i);
-                items[key] = localStorage.getItem(key);
-            }
-            return items;
-        """)
-        session_data['local_storage'] = localStorage
-        print(f"   ✅ Saved {len(localStorage)} localStorage items")
-    except:
-        print("   ⚠️  Could not save localStorage")
-    
-    # Save sessionStorage
-    try:
-        sessionStorage = driver.execute_script("""
-            var items = {};
-            for (var i = 0; i < sessionStorage.length; i++) {
-                var key = sessionStorage.key(i);
-                items[key] = sessionStorage.getItem(key);
-            }
-            return items;
-        """)
-        session_data['session_storage'] = sessionStorage
-        print(f"   ✅ Saved {len(sessionStorage)} sessionStorage items")
-    except:
-        print("   ⚠️  Could not save sessionStorage")
+    # Cookies plus both storages, captured in one script call
+    snapshot = SessionSnapshot.capture(driver)
+    print(f"   ✅ Saved {len(snapshot.data['cookies'])} cookies")
+    print(f"   ✅ Saved {len(snapshot.data['local_storage'])} localStorage items")
+    print(f"   ✅ Saved {len(snapshot.data['session_storage'])} sessionStorage items")
     
     # Save session data
-    session_file = SESSION_DIR / f"{session_name}.pkl"
-    with open(session_file, 'wb') as f:
-        pickle.dump(session_data, f)
+    session_file = snapshot.save(SESSION_DIR / f"{session_name}.json")
     
     print(f"   ✅ Session saved to: {session_file}")
     return session_file
 
 def load_complete_session(driver, session_name="whydonate"):
     """Load EVERYTHING needed to restore session"""
+    snapshot = SessionSnapshot.load(SESSION_DIR / f"{session_name}.json")
+    
+    if snapshot is not None:
+        print(f"\n📂 Loading session snapshot: {session_name}")
+        
+        # Detect stale sessions before touching the browser
+        if not snapshot.is_fresh(MAX_SESSION_AGE):
+            print(f"   ❌ Session is stale (saved {snapshot.age / 3600:.1f}h ago, "
+                  f"expired cookies: {', '.join(snapshot.expired_cookies()) or 'none'})")
+            print("   Save a new session first.")
+            return False
+        
+        cookies, local_items, session_items = snapshot.restore(driver)
+        print(f"   ✅ Restored {cookies} cookies, {local_items} localStorage "
+              f"and {session_items} sessionStorage items")
+        return True
+    
+    # Legacy pickle sessions
     session_file = SESSION_DIR / f"{session_name}.pkl"
     
     if not session_file.exists():
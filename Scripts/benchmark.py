@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+DeskAgent benchmark suite
+Times the campaign pipeline on synthetic campaigns_master.csv files and
+prints the results as JSON, so runs from different releases can be diffed.
+
+    python Scripts/benchmark.py --sizes 1000 10000 100000 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+import deskagent_v1 as deskagent
+import mock_whydonate_server
+
+WORDS = (
+    "help support family medical school community children animals shelter "
+    "water food emergency relief hospital surgery treatment education books "
+    "village clinic rebuild storm flood fire recovery hope together donate"
+).split()
+
+STATUSES = ['draft', 'pending', 'created', 'failed']
+CATEGORIES = ['General', 'Emergency relief', 'Medical', 'Education', 'Animals']
+
+
+def log(message):
+    """Progress goes to stderr so stdout stays valid JSON"""
+    print(message, file=sys.stderr)
+
+
+def synthetic_campaigns(rows, seed=0):
+    """DataFrame of realistic-looking campaigns"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        name = f"Person {i}"
+        # Raw text with the stray whitespace clean_text has to deal with
+        words = rng.choices(WORDS, k=rng.randint(30, 120))
+        text = '  '.join(' '.join(words[j:j + 8]) for j in range(0, len(words), 8))
+        status = rng.choice(STATUSES)
+        records.append({
+            'campaign_id': f"{i:08x}",
+            'name': name,
+            'email': f"person{i}@example.com",
+            'phone': f"+316{i:08d}",
+            'title': f"Help {name} with {rng.choice(WORDS)}",
+            'presentation_text': text,
+            'clean_text': '',
+            'suggested_title': '',
+            'whatsapp_message': '',
+            'whydonate_url': f"https://whydonate.com/en/fundraiser/c-{i}" if status == 'created' else '',
+            'status': status,
+            'created_date': "2024-01-01",
+            'last_updated': "2024-01-01 00:00:00",
+            'category': rng.choice(CATEGORIES),
+            'target_amount': rng.choice([500, 1000, 2500, 5000]),
+            'donation_type': 'one-time',
+            'notes': ''
+        })
+    return pd.DataFrame(records, columns=deskagent.CAMPAIGN_COLUMNS)
+
+
+class Timer:
+    """Collects named timings in milliseconds"""
+
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, func, ops=1):
+        start = time.perf_counter()
+        value = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.results[name] = {'total_ms': round(elapsed, 3), 'ops': ops,
+                              'per_op_ms': round(elapsed / ops, 4)}
+        return value
+
+
+def use_data_dir(directory):
+    """Point CampaignManager at a scratch directory"""
+    deskagent.CSV_PATH = directory / "campaigns_master.csv"
+    deskagent.DB_PATH = directory / "campaigns.db"
+    deskagent.JOURNAL_PATH = directory / "campaigns_master.journal.jsonl"
+    deskagent.IDS_PATH = directory / "campaign_ids.idx"
+    deskagent.BATCH_CHECKPOINT_PATH = directory / "batch_checkpoint.jsonl"
+
+
+def bench_manager(df, directory, backend, ops):
+    """Load/add/update timings for one storage backend"""
+    use_data_dir(directory)
+    for path in (deskagent.DB_PATH, deskagent.JOURNAL_PATH, deskagent.IDS_PATH):
+        path.unlink(missing_ok=True)
+    df.to_csv(deskagent.CSV_PATH, index=False)
+
+    timer = Timer()
+    manager = timer.measure('open', lambda: deskagent.CampaignManager(
+        backend='sqlite' if backend == 'sqlite' else 'csv',
+        journaled=backend == 'journaled'
+    ))
+    try:
+        timer.measure('list_rows', lambda: manager.list_rows(deskagent.CampaignListView.LIST_COLUMNS))
+        timer.measure('load_projected', lambda: manager.load_campaigns(
+            deskagent.CampaignListView.LIST_COLUMNS
+        ))
+        timer.measure('load_cold', manager.load_campaigns)
+        timer.measure('load_warm', manager.load_campaigns)
+
+        ids = df['campaign_id'].sample(min(ops, len(df)), random_state=1).tolist()
+        timer.measure('get', lambda: [manager.get_campaign(cid) for cid in ids], len(ids))
+        timer.measure('pending', manager.pending_campaigns)
+
+        def add():
+            for i in range(ops):
+                manager.add_campaign({
+                    'campaign_id': f"bench-{i}",
+                    'name': f"Bench {i}",
+                    'title': f"Bench campaign {i}",
+                    'presentation_text': "benchmark text"
+                })
+        timer.measure('add', add, ops)
+
+        def update():
+            for cid in ids:
+                manager.update_campaign(cid, {'status': 'pending', 'notes': 'benchmark'})
+        timer.measure('update', update, len(ids))
+
+        timer.measure('bulk_update', lambda: manager.bulk_update(
+            (cid, {'status': 'created', 'whydonate_url': f"https://example.org/{cid}"})
+            for cid in ids
+        ), len(ids))
+    finally:
+        manager.close()
+    return timer.results
+
+
+def bench_text(df):
+    """TextProcessor and WhatsApp message timings"""
+    timer = Timer()
+    processor = deskagent.TextProcessor(
+        deskagent.WhatsAppTemplates.from_config(deskagent.load_config())
+    )
+    texts = df['presentation_text'].tolist()
+    timer.measure('clean_text', lambda: [processor.clean_text(t) for t in texts], len(texts))
+    timer.measure('clean_series', lambda: processor.clean_series(df['presentation_text']), len(texts))
+
+    rows = list(zip(df['name'], df['title'], df['whydonate_url']))
+    timer.measure('whatsapp_message', lambda: [
+        processor.generate_whatsapp_message(name, title, url) for name, title, url in rows
+    ], len(rows))
+    timer.measure('whatsapp_batch', lambda: processor.templates.render_many(df), len(rows))
+    return timer.results
+
+
+def bench_gui(df, directory):
+    """CampaignListView population timings, fed the way the app feeds it (needs a display)"""
+    try:
+        root = deskagent.tk.Tk()
+    except deskagent.tk.TclError as e:
+        return {'skipped': f"no display: {e}"}
+
+    timer = Timer()
+    try:
+        root.withdraw()
+        for virtual in (True, False):
+            use_data_dir(directory)
+            for path in (deskagent.DB_PATH, deskagent.JOURNAL_PATH, deskagent.IDS_PATH):
+                path.unlink(missing_ok=True)
+            df.to_csv(deskagent.CSV_PATH, index=False)
+            manager = deskagent.CampaignManager()
+
+            frame = deskagent.ttk.Frame(root)
+            view = deskagent.CampaignListView(frame, virtual=virtual)
+            mode = 'virtual' if virtual else 'full'
+
+            def populate():
+                view.set_records(manager.list_rows(deskagent.CampaignListView.LIST_COLUMNS))
+                root.update_idletasks()
+            timer.measure(f'{mode}_populate', populate)
+
+            manager.bulk_update((cid, {'status': 'created'}) for cid in df['campaign_id'][::100])
+            timer.measure(f'{mode}_refresh', populate)
+            frame.destroy()
+    finally:
+        root.destroy()
+    return timer.results
+
+
+def bench_site(df, campaigns, latency, failure_rate):
+    """create_campaign throughput against the local mock site (needs Chrome)"""
+    server = mock_whydonate_server.serve_in_background(
+        latency=latency, failure_rate=failure_rate, require_login=False
+    )
+    automator = deskagent.WhydonateAutomator(
+        site=deskagent.MockWhydonateSite(server.base_url)
+    )
+    try:
+        try:
+            timer = Timer()
+            timer.measure('browser_start', lambda: automator.pool.release(automator.pool.acquire()))
+        except Exception as e:
+            return {'skipped': f"browser unavailable: {e}"}
+
+        rows = df.head(campaigns).to_dict('records')
+        outcomes = timer.measure('create_campaign', lambda: [
+            automator.create_campaign(automator.campaign_payload(row)) for row in rows
+        ], len(rows))
+
+        results = timer.results
+        elapsed = results['create_campaign']['total_ms'] / 1000
+        results['created'] = sum(1 for success, _ in outcomes if success)
+        results['failed'] = len(outcomes) - results['created']
+        results['per_minute'] = round(len(rows) / elapsed * 60, 2) if elapsed else None
+        results['server'] = server.stats()
+        return results
+    finally:
+        automator.close()
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeskAgent benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--backends', nargs='+', default=['csv', 'journaled', 'sqlite'],
+                        choices=['csv', 'journaled', 'sqlite'])
+    parser.add_argument('--ops', type=int, default=20,
+                        help="adds/updates timed per backend")
+    parser.add_argument('--skip-gui', action='store_true')
+    parser.add_argument('--site-campaigns', type=int, default=5,
+                        help="campaigns created against the mock site (0 to skip)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="mock site latency in seconds")
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help="mock site submission failure rate")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        'version': deskagent.load_config().get('system', {}).get('version'),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'sizes': {}
+    }
+
+    with tempfile.TemporaryDirectory(prefix="deskagent_bench_") as tmp:
+        for rows in args.sizes:
+            log(f"📊 {rows} rows")
+            df = synthetic_campaigns(rows)
+            directory = Path(tmp) / str(rows)
+            directory.mkdir()
+
+            timer = Timer()
+            timer.measure('write_csv', lambda: df.to_csv(directory / "source.csv", index=False))
+            result = {'generate': timer.results, 'manager': {}}
+
+            for backend in args.backends:
+                log(f"   💾 CampaignManager ({backend})")
+                result['manager'][backend] = bench_manager(df, directory, backend, args.ops)
+
+            log("   📝 Text processing")
+            result['text'] = bench_text(df)
+
+            if not args.skip_gui:
+                log("   🖥️  List population")
+                result['gui'] = bench_gui(df, directory)
+
+            report['sizes'][str(rows)] = result
+
+        if args.site_campaigns:
+            log(f"🌐 Mock site ({args.site_campaigns} campaigns)")
+            report['site'] = bench_site(
+                synthetic_campaigns(args.site_campaigns), args.site_campaigns,
+                args.latency, args.failure_rate
+            )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+        log(f"✅ Results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,80 +4,1150 @@ DeskAgent v1 - Fundraising Campaign Manager
 Automated Whydonate campaign creation with persistent sessions
 """
 
+import time
+STARTED = time.perf_counter()
+
 import sys
-import pandas as pd
+import base64
+import bisect
+import csv
+import hashlib
+import importlib
 import json
 import os
+import queue
+import random
 import re
+import shutil
+import sqlite3
+import string
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote, urlparse
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import time
+
+
+class LazyImport:
+    """Stands in for a module (or one of its attributes) until first use"""
+    
+    def __init__(self, module, attr=None):
+        self._module = module
+        self._attr = attr
+        self._target = None
+    
+    def _load(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._attr) if self._attr else target
+        return self._target
+    
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+    
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+
+# pandas and Selenium take seconds to import, so they load on first use;
+# except clauses need real classes, hence selenium_errors.<Name> there
+pd = LazyImport("pandas")
+webdriver = LazyImport("selenium.webdriver")
+By = LazyImport("selenium.webdriver.common.by", "By")
+Options = LazyImport("selenium.webdriver.chrome.options", "Options")
+WebDriverWait = LazyImport("selenium.webdriver.support.ui", "WebDriverWait")
+EC = LazyImport("selenium.webdriver.support.expected_conditions")
+selenium_errors = LazyImport("selenium.common.exceptions")
 
 # Constants
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 CSV_DIR = DATA_DIR / ".csv"
 PROFILE_DIR = DATA_DIR / "chrome_profile"
+WORKER_PROFILES_DIR = DATA_DIR / "worker_profiles"
 CSV_PATH = CSV_DIR / "campaigns_master.csv"
+DB_PATH = CSV_DIR / "campaigns.db"
+JOURNAL_PATH = CSV_DIR / "campaigns_master.journal.jsonl"
+IDS_PATH = CSV_DIR / "campaign_ids.idx"
+BATCH_CHECKPOINT_PATH = CSV_DIR / "batch_checkpoint.jsonl"
 NOTES_PATH = DATA_DIR / "agent_notes.txt"
 CONFIG_PATH = DATA_DIR / "config.txt"
+COOKIE_BANNERS_PATH = DATA_DIR / "cookie_banners.json"
+SESSION_PATH = DATA_DIR / "sessions" / "whydonate.json"
+EXPORTS_DIR = DATA_DIR / "exports"
 
 # Ensure directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 CSV_DIR.mkdir(parents=True, exist_ok=True)
 PROFILE_DIR.mkdir(parents=True, exist_ok=True)
 
+CAMPAIGN_COLUMNS = [
+    'campaign_id', 'name', 'email', 'phone', 'title',
+    'presentation_text', 'clean_text', 'suggested_title',
+    'whatsapp_message', 'whydonate_url', 'status',
+    'created_date', 'last_updated', 'category', 'target_amount',
+    'donation_type', 'notes',
+    'clean_text_hash', 'suggested_title_hash', 'whatsapp_message_hash'
+]
+
+# Columns that must stay text even when every value looks numeric
+CSV_DTYPES = {
+    col: str for col in
+    ('campaign_id', 'phone', 'clean_text_hash', 'suggested_title_hash', 'whatsapp_message_hash')
+}
+
+
+def load_config():
+    """Load config.txt (JSON with '#' comment lines)"""
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            lines = [line for line in f if not line.lstrip().startswith('#')]
+        return json.loads(''.join(lines))
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Invalid JSON in config: {e}")
+        return {}
+
+
+class SQLiteCampaignStore:
+    """Campaign storage in an indexed SQLite database"""
+    
+    INDEXED_COLUMNS = ('campaign_id', 'status', 'whydonate_url')
+    
+    def __init__(self, db_path, csv_path):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        
+        is_new = not self.db_path.exists()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._ensure_schema(CAMPAIGN_COLUMNS)
+        # Databases without sync state (older versions) count as unsynced
+        self._dirty = self._meta('dirty', '1') == '1'
+        
+        if not self.csv_path.exists():
+            return
+        if is_new:
+            # Seed a fresh database from the existing CSV
+            self.import_csv()
+        elif self.csv_changed():
+            # Edited outside the app since the last sync: the CSV wins, but
+            # unsynced database edits are kept in a side file
+            if self._dirty:
+                conflict = self._conflict_path()
+                self.export_csv(conflict)
+                print(f"⚠️ {self.csv_path.name} changed outside DeskAgent; "
+                      f"unsynced database edits saved to {conflict}")
+            self.import_csv()
+        elif self._dirty:
+            # Left unsynced by a crash: bring the CSV up to date now
+            self.export_csv()
+    
+    def _columns(self):
+        """Column names of the campaigns table, in order"""
+        rows = self.conn.execute('PRAGMA table_info("campaigns")').fetchall()
+        return [row[1] for row in rows]
+    
+    def _ensure_schema(self, columns):
+        """Create the table/indexes and add any missing columns"""
+        with self.conn:
+            existing = self._columns()
+            if not existing:
+                column_sql = ", ".join(f'"{col}"' for col in columns)
+                self.conn.execute(f'CREATE TABLE "campaigns" ({column_sql})')
+            else:
+                for col in columns:
+                    if col not in existing:
+                        self.conn.execute(f'ALTER TABLE "campaigns" ADD COLUMN "{col}"')
+            
+            for col in self.INDEXED_COLUMNS:
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{col}" ON "campaigns" ("{col}")'
+                )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS "meta" ("key" TEXT PRIMARY KEY, "value" TEXT)'
+            )
+    
+    def _meta(self, key, default=None):
+        row = self.conn.execute('SELECT "value" FROM "meta" WHERE "key" = ?', (key,)).fetchone()
+        return row[0] if row else default
+    
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO "meta" ("key", "value") VALUES (?, ?)', (key, value)
+        )
+    
+    def _mark_dirty(self):
+        """Record (inside the caller's transaction) that the CSV is behind"""
+        if not self._dirty:
+            self._set_meta('dirty', '1')
+            self._dirty = True
+    
+    def _csv_stamp(self):
+        try:
+            st = self.csv_path.stat()
+        except FileNotFoundError:
+            return None
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    
+    def csv_changed(self):
+        """True if the CSV was modified since the last import/export"""
+        return self._csv_stamp() != self._meta('csv_stamp')
+    
+    def _mark_synced(self):
+        """Database and CSV now hold the same data"""
+        with self.conn:
+            self._set_meta('csv_stamp', self._csv_stamp())
+            self._set_meta('dirty', '0')
+        self._dirty = False
+    
+    def _conflict_path(self):
+        """Unused side-file path for an export that must not replace the CSV"""
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.csv_path.with_name(f"{self.csv_path.stem}.conflict-{stamp}.csv")
+        suffix = 1
+        while path.exists():
+            path = self.csv_path.with_name(f"{self.csv_path.stem}.conflict-{stamp}-{suffix}.csv")
+            suffix += 1
+        return path
+    
+    @staticmethod
+    def _to_sql_value(value):
+        """Convert pandas missing values to NULL"""
+        if value is None:
+            return None
+        try:
+            if pd.isna(value):
+                return None
+        except (TypeError, ValueError):
+            pass
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+    
+    def _select_sql(self, columns=None):
+        """SELECT of the given columns (NULL for unknown ones), in sheet order"""
+        existing = self._columns()
+        if columns is None:
+            columns = existing
+        select_sql = ", ".join(
+            f'"{col}"' if col in existing else f'NULL AS "{col}"' for col in columns
+        )
+        return f'SELECT {select_sql} FROM "campaigns" ORDER BY rowid'
+    
+    def load(self, columns=None):
+        """Load all campaigns (or just the given columns) as a DataFrame"""
+        return pd.read_sql_query(self._select_sql(columns), self.conn)
+    
+    def rows(self, columns):
+        """Just the given columns of every campaign, as dicts"""
+        cursor = self.conn.execute(self._select_sql(columns))
+        return [dict(zip(columns, row)) for row in cursor]
+    
+    def iter_chunks(self, chunksize, columns=None):
+        """Yield all campaigns as DataFrames of at most chunksize rows"""
+        yield from pd.read_sql_query(self._select_sql(columns), self.conn, chunksize=chunksize)
+    
+    def save(self, df):
+        """Replace all campaigns with the given DataFrame"""
+        self._ensure_schema(list(df.columns))
+        column_sql = ", ".join(f'"{col}"' for col in df.columns)
+        placeholders = ", ".join("?" for _ in df.columns)
+        rows = (
+            [self._to_sql_value(value) for value in row]
+            for row in df.itertuples(index=False, name=None)
+        )
+        
+        with self.conn:
+            self._mark_dirty()
+            self.conn.execute('DELETE FROM "campaigns"')
+            self.conn.executemany(
+                f'INSERT INTO "campaigns" ({column_sql}) VALUES ({placeholders})', rows
+            )
+    
+    def get(self, campaign_id):
+        """Return one campaign as a dict, or None"""
+        cursor = self.conn.execute(
+            'SELECT * FROM "campaigns" WHERE "campaign_id" = ? LIMIT 1', (campaign_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([d[0] for d in cursor.description], row))
+    
+    def exists(self, campaign_id):
+        """True if campaign_id is stored (an index lookup)"""
+        return self.conn.execute(
+            'SELECT 1 FROM "campaigns" WHERE "campaign_id" = ? LIMIT 1', (campaign_id,)
+        ).fetchone() is not None
+    
+    def ids(self):
+        """All stored campaign_ids"""
+        return [row[0] for row in self.conn.execute('SELECT "campaign_id" FROM "campaigns"')]
+    
+    def insert(self, campaign_data):
+        """Insert one campaign"""
+        self._ensure_schema(list(campaign_data.keys()))
+        column_sql = ", ".join(f'"{col}"' for col in campaign_data)
+        placeholders = ", ".join("?" for _ in campaign_data)
+        values = [self._to_sql_value(v) for v in campaign_data.values()]
+        
+        with self.conn:
+            self._mark_dirty()
+            self.conn.execute(
+                f'INSERT INTO "campaigns" ({column_sql}) VALUES ({placeholders})', values
+            )
+    
+    def update(self, campaign_id, updates):
+        """Update one campaign through the campaign_id index"""
+        self._ensure_schema(list(updates.keys()))
+        set_sql = ", ".join(f'"{col}" = ?' for col in updates)
+        values = [self._to_sql_value(v) for v in updates.values()]
+        
+        with self.conn:
+            self._mark_dirty()
+            cursor = self.conn.execute(
+                f'UPDATE "campaigns" SET {set_sql} WHERE "campaign_id" = ?',
+                values + [campaign_id]
+            )
+        return cursor.rowcount > 0
+    
+    def bulk_update(self, updates_by_id):
+        """Update many campaigns in a single transaction"""
+        self._ensure_schema(sorted({key for u in updates_by_id.values() for key in u}))
+        
+        updated = 0
+        with self.conn:
+            self._mark_dirty()
+            for campaign_id, updates in updates_by_id.items():
+                set_sql = ", ".join(f'"{col}" = ?' for col in updates)
+                values = [self._to_sql_value(v) for v in updates.values()]
+                cursor = self.conn.execute(
+                    f'UPDATE "campaigns" SET {set_sql} WHERE "campaign_id" = ?',
+                    values + [campaign_id]
+                )
+                updated += cursor.rowcount > 0
+        return updated
+    
+    def import_csv(self, csv_path=None):
+        """Replace database contents with a CSV file"""
+        df = pd.read_csv(csv_path or self.csv_path, dtype=CSV_DTYPES)
+        self.save(df)
+        if csv_path is None or Path(csv_path) == self.csv_path:
+            self._mark_synced()
+        return len(df)
+    
+    def export_csv(self, csv_path=None):
+        """
+        Write database contents to a CSV file (atomically)
+        campaigns_master.csv is never overwritten if it was edited outside
+        the app since the last sync; the export goes to a side file instead
+        """
+        target = Path(csv_path or self.csv_path)
+        syncing = target == self.csv_path
+        if syncing and self.csv_changed():
+            target = self._conflict_path()
+            syncing = False
+            print(f"⚠️ {self.csv_path.name} changed outside DeskAgent; "
+                  f"database exported to {target} instead")
+        
+        df = self.load()
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                df.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        if syncing:
+            self._mark_synced()
+        return len(df)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+class CampaignJournal:
+    """Append-only JSON-lines log of campaign mutations"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._drop_torn_tail()
+        self.count = len(self.read()[0])
+    
+    def _drop_torn_tail(self):
+        """Remove a partial last line left by a crash mid-append"""
+        if not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            self._rewrite(data[:data.rfind(b"\n") + 1])
+    
+    def _rewrite(self, data):
+        """Atomically replace the journal contents"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    
+    @staticmethod
+    def _json_value(value):
+        """Make pandas/numpy values JSON serializable"""
+        if hasattr(value, 'item'):
+            value = value.item()
+        if isinstance(value, float) and value != value:
+            return None
+        return value
+    
+    def append(self, *records):
+        """Durably append mutation records with a single write and fsync"""
+        lines = []
+        for record in records:
+            record = {
+                key: ({k: self._json_value(v) for k, v in value.items()}
+                      if isinstance(value, dict) else value)
+                for key, value in record.items()
+            }
+            lines.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self.count += len(records)
+    
+    def read(self):
+        """Return (records, byte offset just past the last record)"""
+        if not self.path.exists():
+            return [], 0
+        
+        data = self.path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        records = [
+            json.loads(line) for line in data[:end].decode('utf-8').splitlines()
+            if line.strip()
+        ]
+        return records, end
+    
+    def discard_before(self, offset):
+        """Drop records that have been folded into a snapshot"""
+        data = self.path.read_bytes() if self.path.exists() else b""
+        self._rewrite(data[offset:])
+        self.count = len(self.read()[0])
+    
+    def truncate(self):
+        """Drop all records"""
+        self._rewrite(b"")
+        self.count = 0
+
+
+class CampaignIdAllocator:
+    """
+    Issues unique, time-ordered campaign IDs and keeps an index of every ID
+    ever used (an append-only file, one ID per line)
+    IDs are 16 hex chars: 12 for the creation time in ms, then a 4-char
+    sequence, so sorting IDs sorts by creation time
+    """
+    
+    ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+    SEQUENCE_SPAN = 0x10000
+    
+    def __init__(self, path, seed=None):
+        """seed: callable returning the IDs already in use, read on first use"""
+        self.path = Path(path)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._ids = None
+        self._ordered = []
+        self._last = None
+    
+    def _load(self):
+        """Read the index (and seed IDs) into memory once"""
+        if self._ids is not None:
+            return
+        
+        ids = []
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                ids = [line.strip() for line in f if line.strip()]
+        known = set(ids)
+        
+        # IDs only found in the campaign data (older sheets, a lost index
+        # tail) are added to the index so it stays complete
+        missing = [i for i in (self.seed() if self.seed else ()) if i and i not in known]
+        if missing:
+            self._write(missing)
+            known.update(missing)
+        
+        self._ids = known
+        self._ordered = sorted(i for i in known if self.ID_PATTERN.match(i))
+        self._last = self._ordered[-1] if self._ordered else None
+    
+    def _write(self, ids):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{campaign_id}\n" for campaign_id in ids)
+    
+    def _index(self, campaign_id):
+        """Record campaign_id in memory; time-ordered IDs also go in _ordered"""
+        self._ids.add(campaign_id)
+        if self.ID_PATTERN.match(campaign_id):
+            if not self._ordered or campaign_id > self._ordered[-1]:
+                self._ordered.append(campaign_id)
+            else:
+                bisect.insort(self._ordered, campaign_id)
+            if self._last is None or campaign_id > self._last:
+                self._last = campaign_id
+    
+    def allocate(self):
+        """A new campaign ID, later than (and different from) every indexed one"""
+        with self._lock:
+            self._load()
+            millis = int(time.time() * 1000)
+            if self._last is not None:
+                last_millis, last_sequence = int(self._last[:12], 16), int(self._last[12:], 16)
+            else:
+                last_millis, last_sequence = -1, 0
+            
+            if millis > last_millis:
+                # Random start within the ms keeps other processes' IDs apart
+                sequence = random.randrange(self.SEQUENCE_SPAN // 2)
+            else:
+                # Same ms or the clock went back: continue after the last ID
+                millis, sequence = last_millis, last_sequence + 1
+            
+            while True:
+                if sequence >= self.SEQUENCE_SPAN:
+                    millis, sequence = millis + 1, 0
+                campaign_id = f"{millis:012x}{sequence:04x}"
+                if campaign_id not in self._ids:
+                    break
+                sequence += 1
+            
+            self._write([campaign_id])
+            self._index(campaign_id)
+            return campaign_id
+    
+    def register(self, campaign_id):
+        """Add an externally chosen ID to the index"""
+        with self._lock:
+            self._load()
+            if campaign_id not in self._ids:
+                self._write([campaign_id])
+                self._index(campaign_id)
+    
+    def exists(self, campaign_id):
+        """True if campaign_id has ever been issued or registered"""
+        with self._lock:
+            self._load()
+            return campaign_id in self._ids
+    
+    @classmethod
+    def created_at(cls, campaign_id):
+        """Creation time encoded in a time-ordered ID (None for older IDs)"""
+        if not isinstance(campaign_id, str) or not cls.ID_PATTERN.match(campaign_id):
+            return None
+        return datetime.fromtimestamp(int(campaign_id[:12], 16) / 1000)
+    
+    def ids_between(self, start=None, end=None):
+        """Time-ordered IDs created in [start, end), oldest first"""
+        with self._lock:
+            self._load()
+            low = 0 if start is None else bisect.bisect_left(
+                self._ordered, f"{int(start.timestamp() * 1000):012x}0000"
+            )
+            high = len(self._ordered) if end is None else bisect.bisect_left(
+                self._ordered, f"{int(end.timestamp() * 1000):012x}0000"
+            )
+            return self._ordered[low:high]
+
 
 class CampaignManager:
-    """Manages campaign data in CSV"""
+    """Manages campaign data in CSV (or an indexed SQLite store)"""
     
-    def __init__(self):
+    # Column schema: low-cardinality columns are categoricals, dates are
+    # parsed, amounts are floats, and everything else (IDs included) is text
+    CATEGORY_COLUMNS = ('status', 'category', 'donation_type')
+    DATE_FORMATS = {'created_date': "%Y-%m-%d", 'last_updated': "%Y-%m-%d %H:%M:%S"}
+    DATE_COLUMNS = tuple(DATE_FORMATS)
+    NUMBER_COLUMNS = ('target_amount',)
+    
+    def __init__(self, backend="csv", journaled=False, compact_threshold=500):
         self.csv_path = CSV_PATH
         self._ensure_csv_exists()
+        self._lock = threading.RLock()
+        
+        self.backend = backend
+        self.store = None
+        if backend == "sqlite":
+            self.store = SQLiteCampaignStore(DB_PATH, self.csv_path)
+        
+        # Journaled mode: mutations are O(1) appends, folded in by compact()
+        self.journal = None
+        self.compact_threshold = compact_threshold
+        self._compact_due = compact_threshold
+        self._generation = 0
+        self._compactor = None
+        
+        # Resident copy of the CSV, valid while the files' mtime/size match
+        self._cache = None
+        self._cache_tail = []
+        self._cache_index = {}
+        self._cache_stamp = None
+        
+        # campaign_ids in the sheet (and its header), for O(1) duplicate checks
+        self._ids = None
+        self._ids_stamp = None
+        self._header = None
+        
+        # Every campaign_id ever issued; new IDs come from here
+        self.id_allocator = CampaignIdAllocator(IDS_PATH, seed=self._all_ids)
+        
+        if journaled and self.store is None:
+            self.journal = CampaignJournal(JOURNAL_PATH)
+            records, _ = self.journal.read()
+            self._ids = {row['campaign_id'] for row in self._read_rows_light(['campaign_id'])}
+            self._ids.update(r['data']['campaign_id'] for r in records if r.get('op') == 'add')
     
     def _ensure_csv_exists(self):
         """Create CSV with proper structure if it doesn't exist"""
         if not self.csv_path.exists():
-            columns = [
-                'campaign_id', 'name', 'email', 'phone', 'title',
-                'presentation_text', 'clean_text', 'suggested_title',
-                'whatsapp_message', 'whydonate_url', 'status',
-                'created_date', 'last_updated', 'category', 'target_amount',
-                'donation_type', 'notes'
+            with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerow(CAMPAIGN_COLUMNS)
+    
+    def _all_ids(self):
+        """campaign_ids currently stored, for seeding the ID index"""
+        with self._lock:
+            if self.store:
+                return self.store.ids()
+            return list(self._known_ids())
+    
+    def _scan_ids(self):
+        """CSV header and the set of campaign_ids, via the stdlib reader"""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'campaign_id' not in header:
+                return header, set()
+            pos = header.index('campaign_id')
+            return header, {row[pos] for row in reader if pos < len(row)}
+    
+    def _read_row_light(self, campaign_id):
+        """One campaign's CSV row as a dict, scanning only up to the match"""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'campaign_id' not in header:
+                return None
+            pos = header.index('campaign_id')
+            for row in reader:
+                if pos < len(row) and row[pos] == campaign_id:
+                    return {col: value or None for col, value in zip(header, row)}
+        return None
+    
+    def _read_rows_light(self, columns):
+        """Selected CSV columns via the stdlib reader (no pandas); '' reads as None"""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            positions = [(col, header.index(col) if col in header else None) for col in columns]
+            return [
+                {col: (row[pos] or None) if pos is not None and pos < len(row) else None
+                 for col, pos in positions}
+                for row in reader if row
             ]
-            df = pd.DataFrame(columns=columns)
-            df.to_csv(self.csv_path, index=False)
     
-    def load_campaigns(self):
-        """Load all campaigns from CSV"""
+    def _read_csv(self, columns=None, **kwargs):
+        """Parse the CSV snapshot (only the given columns, if any)"""
+        usecols = None
+        if columns is not None:
+            wanted = set(columns) | {'campaign_id'}
+            usecols = lambda col: col in wanted
+        reader = pd.read_csv(self.csv_path, dtype=self._csv_dtypes(), usecols=usecols, **kwargs)
+        if 'chunksize' in kwargs:
+            return (self._apply_schema(chunk) for chunk in reader)
+        return self._apply_schema(reader)
+    
+    @classmethod
+    def _csv_dtypes(cls):
+        """
+        read_csv dtypes: every column is text (so empty ones aren't float64)
+        except the categoricals; dates and amounts are parsed afterwards
+        """
+        return defaultdict(lambda: str, {col: 'category' for col in cls.CATEGORY_COLUMNS})
+    
+    @classmethod
+    def _parse(cls, key, values):
+        """
+        Convert a Series (or scalar) to the schema type of column key
+        Cells that don't parse exactly (so wouldn't be written back as they
+        were) keep their original text
+        """
+        if key not in cls.DATE_COLUMNS and key not in cls.NUMBER_COLUMNS:
+            return values
+        
+        series = values if isinstance(values, pd.Series) else pd.Series([values], dtype=object)
+        if key in cls.DATE_COLUMNS:
+            if pd.api.types.is_datetime64_any_dtype(series):
+                return values
+            parsed = pd.to_datetime(series, format=cls.DATE_FORMATS[key], errors='coerce')
+        elif pd.api.types.is_numeric_dtype(series):
+            parsed = series.astype(float)
+        else:
+            parsed = pd.to_numeric(series, errors='coerce').astype(float)
+        
+        # Typed cells are exact by definition; text must survive the round trip
+        is_text = series.map(lambda value: isinstance(value, str))
+        exact = ~is_text | cls._format(key, parsed).eq(series)
+        if not exact.all():
+            parsed = parsed.astype(object).where(exact, series)
+        return parsed if isinstance(values, pd.Series) else parsed.iloc[0]
+    
+    @classmethod
+    def _format(cls, key, series):
+        """Text of a schema column as written to the CSV ('' when missing)"""
+        if key in cls.DATE_COLUMNS:
+            fmt = cls.DATE_FORMATS[key]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                return series.dt.strftime(fmt).fillna('')
+            convert = lambda value: value.strftime(fmt)
+        else:
+            # Whole amounts are written without a trailing ".0"
+            convert = lambda value: str(int(value)) if float(value).is_integer() else repr(float(value))
+        return series.map(
+            lambda value: value if isinstance(value, str) else '' if pd.isna(value) else convert(value)
+        )
+    
+    @classmethod
+    def _format_schema(cls, df):
+        """Shallow copy of df with date and amount columns written back as CSV text"""
+        out = df.copy(deep=False)
+        for key in cls.DATE_COLUMNS + cls.NUMBER_COLUMNS:
+            if key in out.columns:
+                out[key] = cls._format(key, out[key])
+        return out
+    
+    @classmethod
+    def _apply_schema(cls, df):
+        """Give df's known columns their schema dtypes"""
+        for key in df.columns:
+            if key in cls.CATEGORY_COLUMNS:
+                if not isinstance(df[key].dtype, pd.CategoricalDtype):
+                    df[key] = df[key].astype('category')
+            elif key in cls.DATE_COLUMNS or key in cls.NUMBER_COLUMNS:
+                if df[key].dtype.kind not in 'fM':
+                    df[key] = cls._parse(key, df[key])
+        return df
+    
+    def _write_csv_tmp(self, df):
+        """Write the CSV to a synced temp file next to it; the caller renames it into place"""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.csv_path.parent, prefix=self.csv_path.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                self._format_schema(df).to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            return tmp_path
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    
+    @classmethod
+    def _widen(cls, df, key, values):
+        """
+        Make column key able to hold values; returns them converted to its type
+        Schema columns keep their dtype, anything else becomes object
+        """
+        if key not in df.columns:
+            df[key] = pd.Series([None] * len(df), index=df.index, dtype=object)
+            return values
+        
+        column = df[key]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            series = values if isinstance(values, pd.Series) else pd.Series([values], dtype=object)
+            new = set(series.dropna()) - set(column.cat.categories)
+            if new:
+                df[key] = column.cat.add_categories(sorted(new, key=str))
+            return values
+        if key in cls.DATE_COLUMNS or key in cls.NUMBER_COLUMNS:
+            values = cls._parse(key, values)
+            kind = (values if isinstance(values, pd.Series) else pd.Series([values])).dtype.kind
+            if column.dtype.kind in 'fM' and kind == column.dtype.kind:
+                return values
+        if column.dtype != object:
+            # Empty columns are parsed as float, and typed columns can't take
+            # text that didn't parse; widen before storing it
+            df[key] = column.astype(object)
+        return values
+    
+    @classmethod
+    def _assign(cls, df, rows, updates):
+        """Set column values on the given rows (boolean mask or positions)"""
+        for key, value in updates.items():
+            value = cls._widen(df, key, value)
+            df.iloc[rows, df.columns.get_loc(key)] = value
+    
+    @classmethod
+    def _apply_updates(cls, df, updates_by_id):
+        """Apply {campaign_id: {column: value}} with one aligned pass per column"""
+        ids = df['campaign_id']
+        
+        by_column = {}
+        for campaign_id, updates in updates_by_id.items():
+            for key, value in updates.items():
+                by_column.setdefault(key, {})[campaign_id] = value
+        
+        for key, values in by_column.items():
+            rows = ids.isin(list(values)).to_numpy()
+            if rows.any():
+                df.loc[rows, key] = cls._widen(df, key, ids[rows].map(values))
+        
+        return int(ids[ids.isin(list(updates_by_id))].nunique())
+    
+    def _replay_journal(self, df, records):
+        """Apply journal records on top of a snapshot"""
+        if not records:
+            return df
+        
+        positions = {}
+        for pos, campaign_id in enumerate(df['campaign_id']):
+            positions.setdefault(campaign_id, []).append(pos)
+        
+        # Replay is idempotent: adds of known IDs are skipped and updates
+        # are re-applied in order, so records already folded are harmless
+        added = {}
+        updated = {}
+        for record in records:
+            if record.get('op') == 'add':
+                row = record['data']
+                campaign_id = row.get('campaign_id')
+                if campaign_id not in positions and campaign_id not in added:
+                    added[campaign_id] = dict(row)
+            elif record.get('op') == 'update':
+                campaign_id = record['campaign_id']
+                if campaign_id in added:
+                    added[campaign_id].update(record['updates'])
+                elif campaign_id in positions:
+                    updated.setdefault(campaign_id, {}).update(record['updates'])
+        
+        self._apply_updates(df, updated)
+        
+        if added:
+            df = pd.concat([df, pd.DataFrame(list(added.values()))], ignore_index=True)
+            df = self._apply_schema(df)
+        return df
+    
+    def _file_stamp(self):
+        """Identify the on-disk state by mtime/size of the CSV (and journal)"""
+        paths = [self.csv_path] + ([self.journal.path] if self.journal else [])
+        stamp = []
+        for path in paths:
+            try:
+                st = path.stat()
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+    
+    def _cache_is_fresh(self):
+        """True if the resident DataFrame matches the files on disk"""
+        return self._cache is not None and self._cache_stamp == self._file_stamp()
+    
+    def _set_cache(self, df, stamp):
+        """Make df the resident copy and rebuild the campaign_id index"""
+        self._cache = df
+        self._cache_tail = []
+        self._cache_stamp = stamp
+        self._cache_index = {}
+        if 'campaign_id' in df.columns:
+            for pos, campaign_id in enumerate(df['campaign_id']):
+                self._cache_index.setdefault(campaign_id, pos)
+    
+    def _cached_campaigns(self):
+        """Resident DataFrame, re-parsed only when the files changed"""
+        with self._lock:
+            if not self._cache_is_fresh():
+                # Stamp before reading, so a concurrent write forces a reload
+                stamp = self._file_stamp()
+                df = self._read_csv()
+                if self.journal:
+                    records, _ = self.journal.read()
+                    df = self._replay_journal(df, records)
+                self._set_cache(df, stamp)
+            return self._resident()
+    
+    def _resident(self):
+        """The cached DataFrame, with rows appended since it was parsed folded in"""
+        if self._cache_tail:
+            tail = pd.DataFrame(self._cache_tail)
+            self._cache = self._apply_schema(pd.concat([self._cache, tail], ignore_index=True))
+            self._cache_tail = []
+        return self._cache
+    
+    def _cache_append(self, campaign_data, stamp):
+        """Queue a new row onto the (fresh) resident copy without copying it"""
+        position = len(self._cache) + len(self._cache_tail)
+        self._cache_tail.append(dict(campaign_data))
+        self._cache_index.setdefault(campaign_data['campaign_id'], position)
+        self._cache_stamp = stamp
+    
+    def _known_ids(self):
+        """Set of campaign_ids in the sheet, rescanned only when the files changed"""
+        if self.journal:
+            return self._ids
+        
+        stamp = self._file_stamp()
+        if self._ids is None or self._ids_stamp != stamp:
+            if self._cache_is_fresh():
+                self._header = list(self._cache.columns)
+                self._ids = set(self._cache_index)
+            else:
+                self._header, self._ids = self._scan_ids()
+            self._ids_stamp = stamp
+        return self._ids
+    
+    def _append_row(self, campaign_data):
+        """
+        Append one campaign to the CSV, in the file's own column order,
+        without rewriting it
+        Returns False (nothing written) when the row has columns the sheet
+        lacks, so the caller has to rewrite it with the new header
+        """
+        if 'campaign_id' not in (self._header or ()) \
+                or not set(campaign_data) <= set(self._header):
+            return False
+        
+        with open(self.csv_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size:
+                f.seek(-1, os.SEEK_END)
+            needs_newline = size and f.read(1) != b'\n'
+        
+        row = [campaign_data.get(col) for col in self._header]
+        with open(self.csv_path, 'a', encoding='utf-8', newline='') as f:
+            if needs_newline:
+                f.write(os.linesep)
+            csv.writer(f, lineterminator=os.linesep).writerow([
+                '' if value is None or value != value else value for value in row
+            ])
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+    
+    def list_rows(self, columns):
+        """
+        Just the given columns of every campaign, as dicts (None when missing)
+        Skips pandas unless the sheet is already resident or the journal has
+        edits to replay
+        """
+        with self._lock:
+            if self.store:
+                return self.store.rows(columns)
+            if self._cache_is_fresh() or (self.journal and self.journal.count):
+                df = self._cached_campaigns().reindex(columns=list(columns))
+                df = df.astype(object).where(df.notna(), None)
+                return df.to_dict('records')
+        return self._read_rows_light(columns)
+    
+    def load_campaigns(self, columns=None):
+        """
+        Load all campaigns
+        columns: only parse these (missing ones come back empty), so callers
+        that don't need the long text columns never pay for them
+        """
         try:
-            return pd.read_csv(self.csv_path)
+            if self.store:
+                with self._lock:
+                    df = self.store.load(columns)
+                return self._apply_schema(df)
+            if columns is None:
+                return self._cached_campaigns().copy()
+            
+            columns = list(columns)
+            with self._lock:
+                if self._cache_is_fresh():
+                    return self._resident().reindex(columns=columns)
+                df = self._read_csv(columns)
+                if self.journal:
+                    records, _ = self.journal.read()
+                    df = self._replay_journal(df, records)
+            return df.reindex(columns=columns)
         except Exception as e:
-            print(f"Error loading CSV: {e}")
+            print(f"Error loading campaigns: {e}")
             return pd.DataFrame()
     
+    def iter_campaigns(self, chunksize=1000, columns=None):
+        """
+        Yield all campaigns as DataFrames of at most chunksize rows
+        Streams from disk unless the sheet is already resident
+        columns: only read these (missing ones come back empty)
+        """
+        if self.store:
+            # The connection is shared across threads: fetch each chunk under the lock
+            chunks = self.store.iter_chunks(chunksize, columns)
+            while True:
+                with self._lock:
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                yield self._apply_schema(chunk)
+        
+        with self._lock:
+            resident = self._resident() if self._cache_is_fresh() else None
+            if resident is None and self.journal and self.journal.count and not self.compact():
+                resident = self._cached_campaigns()
+        
+        if resident is not None:
+            if columns is not None:
+                resident = resident.reindex(columns=list(columns))
+            for start in range(0, len(resident), chunksize):
+                yield resident.iloc[start:start + chunksize].copy()
+            return
+        
+        for chunk in self._read_csv(columns, chunksize=chunksize):
+            yield chunk if columns is None else chunk.reindex(columns=list(columns))
+    
     def save_campaigns(self, df):
-        """Save campaigns to CSV"""
+        """Save all campaigns"""
         try:
-            df.to_csv(self.csv_path, index=False)
+            if self.store:
+                with self._lock:
+                    self.store.save(self._format_schema(df))
+                return True
+            
+            tmp_path = self._write_csv_tmp(df)
+            with self._lock:
+                self._replace_csv(tmp_path)
+                self._generation += 1
+                if self.journal:
+                    self.journal.truncate()
+                    self._ids = set(df['campaign_id'])
+                # The file now holds exactly df; keep it resident
+                self._set_cache(self._apply_schema(df.reset_index(drop=True)), self._file_stamp())
             return True
         except Exception as e:
-            print(f"Error saving CSV: {e}")
+            print(f"Error saving campaigns: {e}")
             return False
     
-    def add_campaign(self, campaign_data):
-        """Add a new campaign"""
+    def compact(self):
+        """Fold the journal into a fresh CSV snapshot (atomic rename)"""
+        if not self.journal:
+            return False
+        
+        with self._lock:
+            generation = self._generation
+            df = self._read_csv()
+            records, offset = self.journal.read()
+        if not records:
+            return True
+        
+        tmp_path = self._write_csv_tmp(self._replay_journal(df, records))
+        with self._lock:
+            if generation != self._generation:
+                # A full save replaced the snapshot meanwhile
+                os.unlink(tmp_path)
+                return False
+            fresh = self._cache_is_fresh()
+            self._replace_csv(tmp_path)
+            self._generation += 1
+            self.journal.discard_before(offset)
+            # Compaction doesn't change content, so the cache stays valid
+            if fresh:
+                self._cache_stamp = self._file_stamp()
+        return True
+    
+    def _replace_csv(self, tmp_path):
+        """Rename a written temp file over the CSV, deleting it if that fails"""
+        try:
+            os.replace(tmp_path, self.csv_path)
+        except OSError:
+            # e.g. the sheet is open in Excel on Windows
+            os.unlink(tmp_path)
+            raise
+    
+    def _journal_append(self, *records):
+        """Append mutations and start background compaction when due"""
+        self.journal.append(*records)
+        
+        if self.journal.count >= self._compact_due and \
+                not (self._compactor and self._compactor.is_alive()):
+            self._compactor = threading.Thread(target=self._background_compact, daemon=True)
+            self._compactor.start()
+    
+    def _background_compact(self):
+        """
+        compact() for the background thread; after a failure the next
+        attempt waits for another compact_threshold records, instead of
+        rewriting the whole sheet on every append
+        """
+        try:
+            self.compact()
+            self._compact_due = self.compact_threshold
+        except Exception as e:
+            self._compact_due = self.journal.count + self.compact_threshold
+            print(f"Journal compaction failed, retrying after "
+                  f"{self.compact_threshold} more changes: {e}")
+    
+    def pending_campaigns(self):
+        """Campaigns not yet created on Whydonate"""
         df = self.load_campaigns()
+        if df.empty:
+            return df
+        return df[df['whydonate_url'].isna() & df['status'].isin(['pending', 'draft'])]
+    
+    def get_campaign(self, campaign_id):
+        """Get a single campaign as a Series, or None if not found"""
+        if self.store:
+            with self._lock:
+                row = self.store.get(campaign_id)
+            return self._schema_row(row) if row is not None else None
         
+        with self._lock:
+            if self._cache_is_fresh():
+                pos = self._cache_index.get(campaign_id)
+                return self._resident().iloc[pos].copy() if pos is not None else None
+            
+            # Sheet not resident: fetch just this row rather than parse everything
+            row = self._read_row_light(campaign_id)
+            records = self.journal.read()[0] if self.journal else []
+        
+        for record in records:
+            if record.get('op') == 'add' and row is None \
+                    and record['data'].get('campaign_id') == campaign_id:
+                row = dict(record['data'])
+            elif record.get('op') == 'update' and row is not None \
+                    and record['campaign_id'] == campaign_id:
+                row.update(record['updates'])
+        return self._schema_row(row) if row is not None else None
+    
+    def _schema_row(self, row):
+        """A row dict as a Series typed like the rows of load_campaigns()"""
+        return self._apply_schema(pd.DataFrame([row], dtype=object)).iloc[0]
+    
+    def add_campaign(self, campaign_data):
+        """Add a new campaign"""
         # Generate ID if not provided
         if 'campaign_id' not in campaign_data or not campaign_data['campaign_id']:
-            import uuid
-            campaign_data['campaign_id'] = str(uuid.uuid4())[:8]
+            campaign_data['campaign_id'] = self.id_allocator.allocate()
+        else:
+            self.id_allocator.register(campaign_data['campaign_id'])
         
         # Set timestamps
         now = datetime.now()
@@ -88,141 +1158,1458 @@ class CampaignManager:
         if 'status' not in campaign_data:
             campaign_data['status'] = 'draft'
         
-        # Add to dataframe
+        if self.store:
+            try:
+                with self._lock:
+                    if self.store.exists(campaign_data['campaign_id']):
+                        print(f"Campaign {campaign_data['campaign_id']} already exists")
+                        return False
+                    self.store.insert(campaign_data)
+                return True
+            except sqlite3.Error as e:
+                print(f"Error adding campaign: {e}")
+                return False
+        
+        if self.journal:
+            with self._lock:
+                if campaign_data['campaign_id'] in self._ids:
+                    print(f"Campaign {campaign_data['campaign_id']} already exists")
+                    return False
+                fresh = self._cache_is_fresh()
+                self._journal_append({'op': 'add', 'data': campaign_data})
+                self._ids.add(campaign_data['campaign_id'])
+                
+                if fresh:
+                    self._cache_append(campaign_data, self._file_stamp())
+            return True
+        
+        with self._lock:
+            if campaign_data['campaign_id'] in self._known_ids():
+                print(f"Campaign {campaign_data['campaign_id']} already exists")
+                return False
+            fresh = self._cache_is_fresh()
+            try:
+                appended = self._append_row(campaign_data)
+            except OSError as e:
+                print(f"Error adding campaign: {e}")
+                return False
+            if appended:
+                stamp = self._file_stamp()
+                self._ids.add(campaign_data['campaign_id'])
+                self._ids_stamp = stamp
+                if fresh:
+                    self._cache_append(campaign_data, stamp)
+                return True
+        
+        # The row brings columns the sheet lacks: rewrite it with them added
+        df = self.load_campaigns()
         new_df = pd.concat([df, pd.DataFrame([campaign_data])], ignore_index=True)
         return self.save_campaigns(new_df)
     
     def update_campaign(self, campaign_id, updates):
         """Update a campaign"""
-        df = self.load_campaigns()
+        updates = dict(updates)
+        updates['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        if campaign_id not in df['campaign_id'].values:
-            return False
+        if self.store:
+            try:
+                with self._lock:
+                    return self.store.update(campaign_id, updates)
+            except sqlite3.Error as e:
+                print(f"Error updating campaign: {e}")
+                return False
         
-        # Apply updates
-        for key, value in updates.items():
-            df.loc[df['campaign_id'] == campaign_id, key] = value
+        if self.journal:
+            with self._lock:
+                if campaign_id not in self._ids:
+                    return False
+                fresh = self._cache_is_fresh()
+                self._journal_append({
+                    'op': 'update', 'campaign_id': campaign_id, 'updates': updates
+                })
+                
+                # Patch the resident copy in place instead of re-replaying
+                if fresh and campaign_id in self._cache_index:
+                    self._assign(self._resident(), [self._cache_index[campaign_id]], updates)
+                    self._cache_stamp = self._file_stamp()
+                else:
+                    self._cache = None
+            return True
+        
+        # Held throughout so concurrent writers (e.g. batch workers) can't
+        # overwrite each other's read-modify-write
+        with self._lock:
+            df = self.load_campaigns()
+            
+            if campaign_id not in df['campaign_id'].values:
+                return False
+            
+            # Apply updates
+            mask = (df['campaign_id'] == campaign_id).to_numpy()
+            self._assign(df, mask, updates)
+            
+            return self.save_campaigns(df)
+    
+    def bulk_update(self, items):
+        """
+        Apply many updates at once and persist a single time
+        items: iterable of (campaign_id, updates) pairs
+        Returns: number of campaigns updated
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Later updates for the same campaign win, as with repeated calls
+        merged = {}
+        for campaign_id, updates in items:
+            merged.setdefault(campaign_id, {}).update(updates)
+        for updates in merged.values():
+            updates['last_updated'] = now
+        
+        if not merged:
+            return 0
+        
+        if self.store:
+            try:
+                with self._lock:
+                    return self.store.bulk_update(merged)
+            except sqlite3.Error as e:
+                print(f"Error updating campaigns: {e}")
+                return 0
         
-        # Update timestamp
-        df.loc[df['campaign_id'] == campaign_id, 'last_updated'] = \
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self.journal:
+            with self._lock:
+                known = {cid: u for cid, u in merged.items() if cid in self._ids}
+                if not known:
+                    return 0
+                fresh = self._cache_is_fresh()
+                self._journal_append(*[
+                    {'op': 'update', 'campaign_id': cid, 'updates': updates}
+                    for cid, updates in known.items()
+                ])
+                
+                if fresh:
+                    self._apply_updates(self._resident(), known)
+                    self._cache_stamp = self._file_stamp()
+                else:
+                    self._cache = None
+            return len(known)
         
-        return self.save_campaigns(df)
+        with self._lock:
+            df = self.load_campaigns()
+            updated = self._apply_updates(df, merged)
+            if not updated:
+                return 0
+            return updated if self.save_campaigns(df) else 0
+    
+    def import_csv(self):
+        """Reload the SQLite store from campaigns_master.csv"""
+        if self.store:
+            with self._lock:
+                return self.store.import_csv()
+        return 0
+    
+    def export_csv(self):
+        """Write the SQLite store back to campaigns_master.csv"""
+        if self.store:
+            with self._lock:
+                return self.store.export_csv()
+        return 0
+    
+    def close(self):
+        """Flush pending state back to campaigns_master.csv"""
+        if self.store:
+            with self._lock:
+                self.store.export_csv()
+                self.store.close()
+        if self.journal:
+            if self._compactor:
+                self._compactor.join()
+            self.compact()
 
 
-class WhydonateAutomator:
-    """Handles Whydonate automation with persistent profile"""
+class DriverPool:
+    """Keeps warm Chrome sessions alive between automation jobs"""
     
-    def __init__(self):
-        self.profile_dir = PROFILE_DIR
+    def __init__(self, factory, size=1, recycle_after=25):
+        self.factory = factory
+        self.size = size
+        self.recycle_after = recycle_after
+        
+        self._idle = []          # most recently used last
+        self._jobs = {}          # every live driver (idle or checked out) -> jobs run
+        self._launching = 0      # slots reserved by drivers still starting
+        # Notified whenever a slot frees up: a driver returned, quit or failed to start
+        self._available = threading.Condition()
     
-    def get_driver(self):
-        """Get Chrome driver with persistent profile"""
-        options = Options()
-        options.add_argument(f"user-data-dir={self.profile_dir}")
-        options.add_argument("profile-directory=Default")
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--no-sandbox')
+    def acquire(self):
+        """
+        Get a healthy idle driver, launching one if the pool has room;
+        waits while every slot is checked out
+        """
+        while True:
+            with self._available:
+                while not self._idle and len(self._jobs) + self._launching >= self.size:
+                    self._available.wait()
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._launching += 1
+            
+            if driver is None:
+                # Launch outside the lock; Chrome takes seconds to start
+                try:
+                    driver = self.factory()
+                finally:
+                    with self._available:
+                        self._launching -= 1
+                        if driver is not None:
+                            self._jobs[driver] = 0
+                        self._available.notify()
+                return driver
+            
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+    
+    def release(self, driver):
+        """Return a driver after a job; crashed or worn-out drivers are quit"""
+        with self._available:
+            if driver not in self._jobs:
+                # Closed while checked out
+                worn_out = True
+            else:
+                self._jobs[driver] += 1
+                worn_out = self._jobs[driver] >= self.recycle_after
         
-        return webdriver.Chrome(options=options)
+        if worn_out or not self._reset(driver):
+            self._discard(driver)
+        else:
+            with self._available:
+                self._idle.append(driver)
+                self._available.notify()
     
-    def test_connection(self):
-        """Test if we can access Whydonate"""
-        driver = self.get_driver()
+    @contextmanager
+    def session(self):
+        """with pool.session() as driver: ..."""
+        driver = self.acquire()
         try:
-            driver.get("https://whydonate.com/en/dashboard")
-            time.sleep(3)
-            return "login" not in driver.current_url
+            yield driver
         finally:
-            driver.quit()
+            self.release(driver)
     
-    def create_campaign(self, campaign_data):
+    @staticmethod
+    def _is_healthy(driver):
+        """Cheap roundtrip to check the browser is still alive"""
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _reset(driver):
+        """Close extra tabs and park on a blank page instead of relaunching"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+    
+    def _discard(self, driver):
+        """Quit a driver and free its slot"""
+        with self._available:
+            self._jobs.pop(driver, None)
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Quit every driver, idle or checked out"""
+        with self._available:
+            drivers = list(self._jobs)
+            self._jobs.clear()
+            self._idle.clear()
+            self._available.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class PageWaiter:
+    """Condition-driven waits, capped by a configurable ceiling (whydonate.timeout)"""
+    
+    def __init__(self, timeout=30, poll_frequency=0.1):
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+    
+    def until(self, driver, condition, timeout=None):
+        """Return condition's first truthy result; raise TimeoutException at the ceiling"""
+        wait = WebDriverWait(driver, timeout or self.timeout,
+                             poll_frequency=self.poll_frequency)
+        return wait.until(condition)
+    
+    def ready(self, driver, timeout=None):
+        """Wait for the document to finish loading"""
+        return self.until(
+            driver,
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout
+        )
+    
+    def element(self, driver, locators, timeout=None):
+        """Wait until any of the (By, selector) locators is present"""
+        return self.until(
+            driver,
+            EC.any_of(*[EC.presence_of_element_located(loc) for loc in locators]),
+            timeout
+        )
+    
+    def url_change(self, driver, old_url, timeout=None):
+        """Wait for navigation away from old_url"""
+        return self.until(driver, EC.url_changes(old_url), timeout)
+
+
+class CookieBannerHandler:
+    """Dismisses cookie banners with one injected script per check"""
+    
+    BANNER_SELECTORS = [
+        # Common European cookie banners
+        "#CybotCookiebotDialog",
+        "#cookie-banner", "#cookie-notice", "#cookieConsent",
+        ".cookie-banner", ".cookie-notice", ".cookie-consent",
+        ".gdpr-banner", ".gdpr-consent", ".privacy-banner",
+        ".consent-banner", ".consent-popup",
+        
+        # Dutch-specific
+        "[data-cy='cookie-banner']", "[data-testid='cookie-banner']",
+        ".cookie-wall", ".cookie-container",
+        
+        # Generic overlays
+        "div[role='alertdialog']", "div[aria-label*='cookie']",
+        "div[class*='cookie']", "div[id*='cookie']"
+    ]
+    
+    ACCEPT_TEXTS = [
+        # English
+        "Accept All Cookies", "Accept All", "Accept Cookies", "Accept",
+        "I Accept", "Agree All", "Agree", "Allow All", "Allow",
+        "Give Consent", "Consent", "Okay", "OK", "Got it", "Continue",
+        "Proceed", "Understand", "Close",
+        # Dutch
+        "Alles accepteren", "Cookies accepteren", "Accepteren",
+        "Akkoord met alles", "Akkoord", "Doorgaan", "Begrepen",
+        "Sluiten", "Alles toestaan", "Toestaan",
+        # Short/icon buttons
+        "×", "✕", "X"
+    ]
+    
+    # arguments[0]: banner selectors, arguments[1]: accept texts (both in
+    # preference order). Returns {selector, text, action} or null.
+    DISMISS_SCRIPT = """
+        var selectors = arguments[0], texts = arguments[1];
+        function visible(el) {
+            var rect = el.getBoundingClientRect(), style = getComputedStyle(el);
+            return rect.width > 0 && rect.height > 0 &&
+                style.visibility !== 'hidden' && style.display !== 'none';
+        }
+        for (var i = 0; i < selectors.length; i++) {
+            var banners;
+            try { banners = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+            for (var j = 0; j < banners.length; j++) {
+                var banner = banners[j];
+                if (!visible(banner)) { continue; }
+                
+                var buttons = Array.prototype.filter.call(
+                    banner.querySelectorAll("button, [role='button'], input[type='button'], input[type='submit']"),
+                    function (b) { return visible(b) && !b.disabled; }
+                );
+                for (var k = 0; k < texts.length; k++) {
+                    for (var m = 0; m < buttons.length; m++) {
+                        var label = (buttons[m].innerText || buttons[m].value || '').trim();
+                        if (label.indexOf(texts[k]) !== -1) {
+                            buttons[m].click();
+                            return {selector: selectors[i], text: texts[k], action: 'clicked'};
+                        }
+                    }
+                }
+                if (buttons.length) {
+                    buttons[0].click();
+                    return {selector: selectors[i], text: null, action: 'clicked'};
+                }
+                banner.style.display = 'none';
+                return {selector: selectors[i], text: null, action: 'hidden'};
+            }
+        }
+        return null;
+    """
+    
+    def __init__(self, waiter, memory_path=None, grace=2):
+        self.waiter = waiter
+        self.grace = grace
+        self.memory_path = memory_path or COOKIE_BANNERS_PATH
+        self.memory = self._load_memory()
+        self._handled_domains = set()
+        self._lock = threading.Lock()
+    
+    def _load_memory(self):
+        """Selector/text pairs that worked before, per domain"""
+        try:
+            with open(self.memory_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _remember(self, domain, result):
+        with self._lock:
+            self.memory[domain] = {'selector': result['selector'], 'text': result['text']}
+            try:
+                with open(self.memory_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.memory, f, indent=2, ensure_ascii=False)
+            except OSError as e:
+                print(f"Could not save cookie banner memory: {e}")
+    
+    def _ordered(self, domain):
+        """Selectors and texts with the domain's known-good pair first"""
+        known = self.memory.get(domain, {})
+        selectors = list(self.BANNER_SELECTORS)
+        texts = list(self.ACCEPT_TEXTS)
+        if known.get('selector'):
+            selectors = [known['selector']] + [s for s in selectors if s != known['selector']]
+        if known.get('text'):
+            texts = [known['text']] + [t for t in texts if t != known['text']]
+        return selectors, texts
+    
+    def dismiss(self, driver):
+        """
+        Dismiss a cookie banner on the current page if one shows up
+        Returns: {'selector', 'text', 'action'} or None
+        """
+        domain = urlparse(driver.current_url).hostname or ''
+        selectors, texts = self._ordered(domain)
+        
+        def check(d):
+            return d.execute_script(self.DISMISS_SCRIPT, selectors, texts)
+        
+        try:
+            if domain in self._handled_domains:
+                # Consent is already stored; only look once
+                result = check(driver)
+            else:
+                # Banners load asynchronously, so poll briefly on first visit
+                result = self.waiter.until(driver, check, self.grace)
+        except selenium_errors.TimeoutException:
+            result = None
+        
+        self._handled_domains.add(domain)
+        if result and result['action'] == 'clicked' and \
+                self.memory.get(domain) != {'selector': result['selector'], 'text': result['text']}:
+            self._remember(domain, result)
+        return result
+
+
+class SessionSnapshot:
+    """Versioned JSON snapshot of a logged-in browser session"""
+    
+    VERSION = 1
+    
+    CAPTURE_SCRIPT = """
+        function dump(storage) {
+            var items = {};
+            for (var i = 0; i < storage.length; i++) {
+                var key = storage.key(i);
+                items[key] = storage.getItem(key);
+            }
+            return items;
+        }
+        return [dump(localStorage), dump(sessionStorage)];
+    """
+    
+    # arguments[0]/[1]: localStorage/sessionStorage items, passed as data
+    RESTORE_SCRIPT = """
+        var local = arguments[0], session = arguments[1];
+        localStorage.clear();
+        sessionStorage.clear();
+        Object.keys(local).forEach(function (key) { localStorage.setItem(key, local[key]); });
+        Object.keys(session).forEach(function (key) { sessionStorage.setItem(key, session[key]); });
+        return [localStorage.length, sessionStorage.length];
+    """
+    
+    def __init__(self, data):
+        self.data = data
+    
+    @classmethod
+    def capture(cls, driver):
+        """Snapshot cookies and both storages of the current page"""
+        local_storage, session_storage = driver.execute_script(cls.CAPTURE_SCRIPT)
+        parsed = urlparse(driver.current_url)
+        return cls({
+            'version': cls.VERSION,
+            'saved_at': time.time(),
+            'origin': f"{parsed.scheme}://{parsed.netloc}",
+            'url': driver.current_url,
+            'cookies': driver.get_cookies(),
+            'local_storage': local_storage,
+            'session_storage': session_storage
+        })
+    
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot; None if missing, unreadable or another version"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Invalid session snapshot {path}: {e}")
+            return None
+        if data.get('version') != cls.VERSION:
+            print(f"Unsupported session snapshot version: {data.get('version')}")
+            return None
+        return cls(data)
+    
+    def save(self, path):
+        """Write the snapshot atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+    
+    @property
+    def age(self):
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.data.get('saved_at', 0)
+    
+    def expired_cookies(self, now=None):
+        """Names of cookies whose expiry has passed"""
+        now = now or time.time()
+        return [
+            cookie['name'] for cookie in self.data.get('cookies', [])
+            if cookie.get('expiry') is not None and cookie['expiry'] <= now
+        ]
+    
+    def is_fresh(self, max_age=None):
+        """True if younger than max_age seconds and no cookie has expired"""
+        if max_age is not None and self.age > max_age:
+            return False
+        return not self.expired_cookies()
+    
+    def restore(self, driver):
+        """
+        Restore cookies and storages with as few roundtrips as possible
+        Returns: (cookies restored, localStorage items, sessionStorage items)
+        """
+        cookies = self.data.get('cookies', [])
+        
+        try:
+            # Chrome can set every cookie in one CDP call, before navigating
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [
+                {key: value for key, value in {
+                    'name': c['name'], 'value': c['value'], 'domain': c.get('domain'),
+                    'path': c.get('path', '/'), 'secure': c.get('secure', False),
+                    'httpOnly': c.get('httpOnly', False), 'sameSite': c.get('sameSite'),
+                    'expires': c.get('expiry')
+                }.items() if value is not None}
+                for c in cookies
+            ]})
+            driver.get(self.data['origin'])
+        except (AttributeError, selenium_errors.WebDriverException):
+            # Fallback: WebDriver cookies need the origin loaded first
+            driver.get(self.data['origin'])
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except selenium_errors.WebDriverException:
+                    pass
+        
+        local_count, session_count = driver.execute_script(
+            self.RESTORE_SCRIPT,
+            self.data.get('local_storage', {}),
+            self.data.get('session_storage', {})
+        )
+        return len(cookies), local_count, session_count
+
+
+class SessionProbe:
+    """Login-state check from persisted cookies/tokens, cached with a TTL"""
+    
+    # Chrome stores cookie expiry as microseconds since 1601-01-01
+    CHROME_EPOCH_OFFSET = 11644473600
+    
+    def __init__(self, profile_dir=None, snapshot_path=None, domain="whydonate.com",
+                 auth_cookies=('token', 'access_token', 'refresh_token', 'auth_token',
+                               'jwt', 'sessionid'),
+                 browser_check=None, ttl=300, snapshot_max_age=7 * 24 * 3600):
+        self.profile_dir = Path(profile_dir or PROFILE_DIR)
+        self.snapshot_path = snapshot_path or SESSION_PATH
+        # A snapshot older than this no longer counts, whatever its cookies say
+        self.snapshot_max_age = snapshot_max_age
+        self.domain = domain
+        self.auth_cookies = {name.lower() for name in auth_cookies}
+        self.browser_check = browser_check
+        self.ttl = ttl
+        self._cached = None
+    
+    @staticmethod
+    def jwt_expiry(value):
+        """exp claim of a JWT-shaped string, or None if it isn't one"""
+        parts = str(value).split('.')
+        if len(parts) != 3:
+            return None
+        try:
+            header, payload = (
+                json.loads(base64.urlsafe_b64decode(part + '=' * (-len(part) % 4)))
+                for part in parts[:2]
+            )
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(header, dict) or 'alg' not in header or not isinstance(payload, dict):
+            return None
+        return payload.get('exp', float('inf'))
+    
+    def _matches_domain(self, host):
+        host = (host or '').lstrip('.')
+        return host == self.domain or host.endswith('.' + self.domain)
+    
+    def _profile_credentials(self):
+        """(name, expiry) of auth cookies in the Chrome profile's cookie DB"""
+        for db_path in (self.profile_dir / "Default" / "Network" / "Cookies",
+                        self.profile_dir / "Default" / "Cookies"):
+            if not db_path.exists():
+                continue
+            try:
+                # immutable: read even while Chrome holds the database
+                conn = sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro&immutable=1", uri=True)
+                try:
+                    rows = conn.execute(
+                        "SELECT host_key, name, expires_utc, has_expires FROM cookies"
+                    ).fetchall()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"Could not read profile cookies: {e}")
+                return []
+            
+            return [
+                (name, expires / 1e6 - self.CHROME_EPOCH_OFFSET if has_expires else None)
+                for host, name, expires, has_expires in rows
+                if self._matches_domain(host) and name.lower() in self.auth_cookies
+            ]
+        return []
+    
+    def _snapshot_credentials(self):
+        """
+        (name, expiry) of auth cookies and JWTs in the session snapshot; no
+        expiry is later than the snapshot's own (saved_at + snapshot_max_age)
+        """
+        snapshot = SessionSnapshot.load(self.snapshot_path)
+        if snapshot is None:
+            return []
+        
+        limit = snapshot.data.get('saved_at', 0) + self.snapshot_max_age
+        credentials = []
+        for cookie in snapshot.data.get('cookies', []):
+            if not self._matches_domain(cookie.get('domain')):
+                continue
+            expiry = self.jwt_expiry(cookie.get('value', ''))
+            if expiry is not None or cookie['name'].lower() in self.auth_cookies:
+                credentials.append((cookie['name'], expiry or cookie.get('expiry')))
+        
+        for storage in ('local_storage', 'session_storage'):
+            for key, value in snapshot.data.get(storage, {}).items():
+                expiry = self.jwt_expiry(value)
+                if expiry is not None:
+                    credentials.append((key, expiry))
+        return [(name, limit if expiry is None else min(expiry, limit))
+                for name, expiry in credentials]
+    
+    def check_local(self):
+        """
+        Decide from local evidence only: logged in if the snapshot or the
+        Chrome profile holds an unexpired credential (profile_setup.py only
+        writes the profile, so an old snapshot must not hide a fresh login)
+        Returns: (True/False, source), or (None, None) when there is no evidence
+        """
+        now = time.time()
+        seen = []
+        for source, credentials in (('snapshot', self._snapshot_credentials()),
+                                    ('profile', self._profile_credentials())):
+            if any(expiry is None or expiry > now for _, expiry in credentials):
+                return True, source
+            if credentials:
+                seen.append(source)
+        return (False, '+'.join(seen)) if seen else (None, None)
+    
+    def probe(self, allow_browser=True, force=False):
+        """
+        Login state, from cache, local evidence or (if needed) the browser
+        force: skip the cache and local evidence and ask the browser
+        (when allowed), e.g. for an explicit "Test Connection"
+        Returns: {'logged_in': True/False/None, 'source': ..., 'checked_at': ...}
+        """
+        if not force and self._cached and time.time() - self._cached['checked_at'] < self.ttl:
+            return dict(self._cached, source='cache')
+        
+        if force and allow_browser and self.browser_check:
+            logged_in, source = None, None
+        else:
+            logged_in, source = self.check_local()
+        if logged_in is None and allow_browser and self.browser_check:
+            logged_in, source = self.browser_check(), 'browser'
+        
+        result = {'logged_in': logged_in, 'source': source, 'checked_at': time.time()}
+        if logged_in is not None:
+            self._cached = result
+        return result
+    
+    def invalidate(self):
+        """Forget the cached result, e.g. after the site asked for a login"""
+        self._cached = None
+
+
+class WhydonateSite:
+    """
+    Site driver: where the Whydonate pages live and how to recognise them
+    WhydonateAutomator drives whatever site driver it is given, so the same
+    creation flow can run against the mock server in Scripts/
+    """
+    
+    name = "whydonate"
+    default_base_url = "https://whydonate.com"
+    SUBMIT_TEXTS = ['Publish', 'Create', 'Submit', 'Save']
+    
+    def __init__(self, base_url=None):
+        self.base_url = (base_url or self.default_base_url).rstrip('/')
+    
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+    
+    @property
+    def dashboard_url(self):
+        return self.url("/en/dashboard")
+    
+    @property
+    def login_url(self):
+        return self.url("/account/login")
+    
+    @property
+    def create_url(self):
+        return self.url("/en/fundraiser/create")
+    
+    def is_login_page(self, url):
+        return "login" in urlparse(url).path
+    
+    def is_campaign_page(self, url):
+        """True for a created fundraiser's page (not the create form)"""
+        path = urlparse(url).path.rstrip('/')
+        return "/fundraiser/" in path and not path.endswith("/create")
+    
+    def field_locators(self, field_name):
+        """Locators for a form field, in fallback order"""
+        return [
+            (By.NAME, field_name),
+            (By.CSS_SELECTOR, f"input[name='{field_name}']"),
+            (By.CSS_SELECTOR, f"textarea[name='{field_name}']"),
+            (By.CSS_SELECTOR, f"#{field_name}"),
+            (By.CSS_SELECTOR, f"[placeholder*='{field_name.title()}']")
+        ]
+
+
+class MockWhydonateSite(WhydonateSite):
+    """Site driver for Scripts/mock_whydonate_server.py"""
+    
+    name = "mock"
+    default_base_url = "http://127.0.0.1:8765"
+
+
+SITE_DRIVERS = {site.name: site for site in (WhydonateSite, MockWhydonateSite)}
+
+
+class WhydonateAutomator:
+    """Handles Whydonate automation with persistent profile"""
+    
+    # Fills every field in one roundtrip: arguments[0] is a list of
+    # {name, value, selectors}; returns {name: {found, selector, filled}}
+    FILL_FORM_SCRIPT = """
+        var fields = arguments[0];
+        var CONTROLS = 'input, textarea, select, [contenteditable]';
+        
+        function fill(el, value) {
+            el.focus();
+            var filled;
+            if (el.isContentEditable) {
+                el.innerText = value;
+                filled = el.innerText === value;
+            } else if (el.tagName === 'SELECT') {
+                var match = Array.prototype.find.call(el.options, function (o) {
+                    return o.value === value || o.text.trim() === value;
+                });
+                if (match) { el.value = match.value; }
+                filled = !!match;
+            } else {
+                // Use the native setter so framework-bound inputs see the change
+                var proto = el.tagName === 'TEXTAREA'
+                    ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+                Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+                filled = el.value === value;
+            }
+            ['input', 'change', 'blur'].forEach(function (type) {
+                el.dispatchEvent(new Event(type, {bubbles: true}));
+            });
+            return filled;
+        }
+        
+        var report = {};
+        fields.forEach(function (field) {
+            var result = {found: false, selector: null, filled: false};
+            // Try every form control each selector matches until one takes
+            // the value; <meta name=...> or wrapper <div>s are skipped
+            for (var i = 0; i < field.selectors.length && !result.filled; i++) {
+                var matches = [];
+                try {
+                    matches = document.querySelectorAll(field.selectors[i]);
+                } catch (e) {}
+                for (var j = 0; j < matches.length && !result.filled; j++) {
+                    if (!matches[j].matches(CONTROLS)) { continue; }
+                    result.found = true;
+                    result.selector = field.selectors[i];
+                    try {
+                        result.filled = fill(matches[j], field.value);
+                    } catch (e) {}
+                }
+            }
+            report[field.name] = result;
+        });
+        return report;
+    """
+    
+    # Start of create_campaign()'s error when the session is logged out
+    NOT_LOGGED_IN = "Not logged in"
+    
+    def __init__(self, recycle_after=25, timeout=30, fast_fill=True, site=None, session_path=None, session_max_age=7 * 24 * 3600,
+                 session_refresh=3600):
+        self.profile_dir = PROFILE_DIR
+        self.site = site or WhydonateSite()
+        self.fast_fill = fast_fill
+        self.wait = PageWaiter(timeout)
+        self.banners = CookieBannerHandler(self.wait)
+        # Snapshot of the logged-in session, replayed when a browser (e.g. a
+        # cloned worker profile) lands on the login page; re-captured at
+        # most every session_refresh seconds while logged in
+        self.session_path = Path(session_path or SESSION_PATH)
+        self.session_max_age = session_max_age
+        self.session_refresh = session_refresh
+        # Called (from worker threads) when the site turns out to be logged out
+        self.on_logged_out = None
+        # One profile can only be opened by one browser, so one warm driver
+        self.pool = DriverPool(self.get_driver, size=1, recycle_after=recycle_after)
+    
+    def get_driver(self, profile_dir=None):
+        """Get Chrome driver with persistent profile"""
+        options = Options()
+        options.add_argument(f"user-data-dir={profile_dir or self.profile_dir}")
+        options.add_argument("profile-directory=Default")
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--no-sandbox')
+        
+        return webdriver.Chrome(options=options)
+    
+    def test_connection(self):
+        """Test if we can access Whydonate (the create form loads logged in)"""
+        with self.pool.session() as driver:
+            try:
+                logged_in = self._open_create_form(driver) or self._restore_session(driver)
+            except selenium_errors.TimeoutException:
+                return False
+            if logged_in:
+                self._save_session(driver)
+            return logged_in
+    
+    def _open_create_form(self, driver):
+        """
+        Load the create page and wait for its first field or for the site to
+        bounce to its login page, whichever comes first
+        Returns True once the form is there, False on the login page; raises
+        TimeoutException if neither happens
+        """
+        driver.get(self.site.create_url)
+        self.wait.ready(driver)
+        self.banners.dismiss(driver)
+        # The form is rendered client-side, as is the logged-out redirect
+        self.wait.until(driver, EC.any_of(
+            *[EC.presence_of_element_located(loc) for loc in self._field_locators('title')],
+            self._on_login_page
+        ))
+        return not self._on_login_page(driver)
+    
+    def _restore_session(self, driver):
+        """
+        Replay the saved session snapshot (one cookie call, one storage script)
+        and reopen the create form; False if there is no fresh snapshot or it
+        didn't log in
+        """
+        snapshot = SessionSnapshot.load(self.session_path)
+        if snapshot is None or not snapshot.is_fresh(self.session_max_age):
+            return False
+        snapshot.restore(driver)
+        return self._open_create_form(driver)
+    
+    def _save_session(self, driver):
+        """Snapshot the logged-in session unless the saved one is recent"""
+        try:
+            if time.time() - self.session_path.stat().st_mtime < self.session_refresh:
+                return
+        except FileNotFoundError:
+            pass
+        try:
+            SessionSnapshot.capture(driver).save(self.session_path)
+        except (OSError, selenium_errors.WebDriverException) as e:
+            print(f"Could not save session snapshot: {e}")
+    
+    def _on_login_page(self, driver):
+        """True if the site sent the browser to its login page"""
+        return self.site.is_login_page(driver.current_url)
+    
+    @staticmethod
+    def campaign_payload(campaign):
+        """
+        Build create_campaign() data from a campaign row
+        Empty cells (None, NaN, '') count as missing and get the fallbacks
+        Raises ValueError if the row's target_amount isn't a number
+        """
+        def value(*columns, default=''):
+            for column in columns:
+                cell = campaign.get(column)
+                if cell is not None and not pd.isna(cell) and str(cell).strip():
+                    return cell
+            return default
+        
+        target_amount = value('target_amount', default=1000.0)
+        try:
+            target_amount = float(target_amount)
+        except (TypeError, ValueError):
+            raise ValueError(f"target_amount {target_amount!r} is not a number")
+        return {
+            'title': str(value('title')),
+            'description': str(value('clean_text', 'presentation_text')),
+            'category': str(value('category', default='General')),
+            'target_amount': target_amount
+        }
+    
+    def create_campaign(self, campaign_data, progress=None, pool=None):
         """
         Create a campaign on Whydonate
+        progress: optional callable receiving status messages
+        pool: DriverPool to use instead of the automator's own
         Returns: (success, url_or_error)
         """
-        driver = self.get_driver()
+        report = progress or (lambda message: None)
+        
+        report("Starting browser...")
         
         try:
-            # Navigate to create page
-            driver.get("https://whydonate.com/en/fundraiser/create")
-            time.sleep(5)
-            
-            # Fill form fields
-            fields = [
-                ('title', campaign_data.get('title', '')),
-                ('category', campaign_data.get('category', 'General')),
-                ('description', campaign_data.get('description', '')),
-                ('goal_amount', str(campaign_data.get('target_amount', 1000)))
-            ]
-            
-            for field_name, value in fields:
-                if value:
-                    self._fill_field(driver, field_name, value)
-                    time.sleep(1)
-            
-            # Submit
-            return self._submit_form(driver)
+            with (pool or self.pool).session() as driver:
+                report("Opening create page...")
+                try:
+                    logged_in = self._open_create_form(driver)
+                    if not logged_in:
+                        report("Restoring saved session...")
+                        logged_in = self._restore_session(driver)
+                except selenium_errors.TimeoutException:
+                    return False, "Create form did not load"
+                if not logged_in:
+                    if self.on_logged_out:
+                        self.on_logged_out()
+                    return False, f"{self.NOT_LOGGED_IN} - sign in at {self.site.login_url}"
+                
+                # Fill form fields
+                fields = [
+                    ('title', campaign_data.get('title', '')),
+                    ('category', campaign_data.get('category', 'General')),
+                    ('description', campaign_data.get('description', '')),
+                    ('goal_amount', str(campaign_data.get('target_amount', 1000)))
+                ]
+                
+                if self.fast_fill:
+                    report("Filling form...")
+                    filled = self._fill_form(driver, fields)
+                    missing = [name for name, result in filled.items() if not result['filled']]
+                    if missing:
+                        # Fall back to filling those one element at a time
+                        report(f"Could not fill: {', '.join(missing)}; retrying")
+                        for field_name, value in fields:
+                            if field_name in missing:
+                                self._fill_field(driver, field_name, value)
+                else:
+                    for field_name, value in fields:
+                        if value:
+                            report(f"Filling {field_name}...")
+                            self._fill_field(driver, field_name, value)
+                
+                # Submit
+                report("Submitting form...")
+                success, result = self._submit_form(driver)
+                if success:
+                    self._save_session(driver)
+                return success, result
             
         except Exception as e:
             return False, str(e)
-        finally:
-            driver.quit()
+    
+    def close(self):
+        """Quit pooled browsers"""
+        self.pool.close()
+    
+    def _field_locators(self, field_name):
+        """Locators for a form field, in fallback order"""
+        return self.site.field_locators(field_name)
+    
+    def _field_selectors(self, field_name):
+        """CSS equivalents of _field_locators, for use inside the page"""
+        return [
+            f"[name='{selector}']" if by == By.NAME else selector
+            for by, selector in self._field_locators(field_name)
+        ]
+    
+    def _fill_form(self, driver, fields):
+        """
+        Fill all fields with a single execute_script call
+        Returns: {field_name: {'found', 'selector', 'filled'}}
+        """
+        payload = [
+            {'name': name, 'value': value, 'selectors': self._field_selectors(name)}
+            for name, value in fields if value
+        ]
+        return driver.execute_script(self.FILL_FORM_SCRIPT, payload) or {}
     
     def _fill_field(self, driver, field_name, value):
         """Fill a form field"""
-        try:
-            # Try by name first
-            element = driver.find_element(By.NAME, field_name)
-            element.clear()
-            element.send_keys(value)
-        except:
-            # Try other selectors
-            selectors = [
-                f"input[name='{field_name}']",
-                f"textarea[name='{field_name}']",
-                f"#{field_name}",
-                f"[placeholder*='{field_name.title()}']"
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = driver.find_element(By.CSS_SELECTOR, selector)
-                    element.clear()
-                    element.send_keys(value)
-                    break
-                except:
-                    continue
+        for locator in self._field_locators(field_name):
+            try:
+                element = driver.find_element(*locator)
+                element.clear()
+                element.send_keys(value)
+                break
+            except:
+                continue
+    
+    def _submit_form(self, driver):
+        """Submit the form and return result"""
+        # Look for submit button
+        for text in self.site.SUBMIT_TEXTS:
+            try:
+                button = driver.find_element(
+                    By.XPATH, f"//button[contains(text(), '{text}')]"
+                )
+                if button.is_displayed():
+                    form_url = driver.current_url
+                    button.click()
+                    
+                    # Check if successful
+                    try:
+                        self.wait.url_change(driver, form_url)
+                    except selenium_errors.TimeoutException:
+                        return False, "Submission failed - not redirected"
+                    
+                    if self.site.is_campaign_page(driver.current_url):
+                        return True, driver.current_url
+                    else:
+                        return False, "Submission failed - not redirected"
+            except:
+                continue
+        
+        return False, "No submit button found"
+
+
+class ParallelCampaignCreator:
+    """Creates campaigns concurrently, one cloned Chrome profile per thread"""
+    
+    # Caches and single-instance locks are not needed in a clone
+    CLONE_IGNORE = (
+        'Singleton*', 'DevToolsActivePort', 'Cache', 'Code Cache', 'GPUCache',
+        'GrShaderCache', 'GraphiteDawnCache', 'ShaderCache', 'DawnGraphiteCache',
+        'DawnWebGPUCache', 'Crashpad', '*.pma', 'component_crx_cache',
+        'extensions_crx_cache', 'optimization_guide_model_store'
+    )
+    # The login lives in the cookie database; Preferences etc. change on every run
+    COOKIE_FILES = ('Default/Cookies', 'Default/Network/Cookies')
+    
+    def __init__(self, automator, max_threads=3, recycle_after=25):
+        self.automator = automator
+        self.max_threads = max(1, max_threads)
+        self.recycle_after = recycle_after
+    
+    def _profile_stamp(self):
+        """Latest change to the cookie database that holds the logged-in session"""
+        stamps = [
+            (self.automator.profile_dir / name).stat().st_mtime
+            for name in self.COOKIE_FILES
+            if (self.automator.profile_dir / name).exists()
+        ]
+        return str(max(stamps, default=0))
+    
+    def clone_profile(self, index):
+        """Copy the logged-in profile for worker index (refreshed when it changes)"""
+        target = WORKER_PROFILES_DIR / f"worker_{index}"
+        marker = target / ".cloned_from"
+        stamp = self._profile_stamp()
+        
+        if not marker.exists() or marker.read_text() != stamp:
+            if target.exists():
+                shutil.rmtree(target)
+            shutil.copytree(self.automator.profile_dir, target,
+                            ignore=shutil.ignore_patterns(*self.CLONE_IGNORE))
+            marker.write_text(stamp)
+        return target
+    
+    def run(self, jobs, on_result=None, on_start=None):
+        """
+        Create campaigns from jobs, a list of (campaign_id, campaign_data)
+        on_start(campaign_id) is called from worker threads before each submission
+        on_result(campaign_id, success, url_or_error) is called from worker threads
+        Stops taking new jobs after the first "not logged in" result
+        Returns: summary dict with per-campaign results and throughput
+        """
+        threads = min(self.max_threads, len(jobs))
+        pending = queue.Queue()
+        for job in jobs:
+            pending.put(job)
+        
+        results = {}
+        results_lock = threading.Lock()
+        # Set once the session turns out to be logged out: every other job would fail too
+        logged_out = threading.Event()
+        started = time.perf_counter()
+        
+        def work(pool):
+            try:
+                while not logged_out.is_set():
+                    try:
+                        campaign_id, campaign_data = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    
+                    if on_start:
+                        on_start(campaign_id)
+                    success, result = self.automator.create_campaign(campaign_data, pool=pool)
+                    if not success and str(result).startswith(WhydonateAutomator.NOT_LOGGED_IN):
+                        logged_out.set()
+                    with results_lock:
+                        results[campaign_id] = (success, result)
+                    if on_result:
+                        on_result(campaign_id, success, result)
+            finally:
+                if pool is not self.automator.pool:
+                    pool.close()
+        
+        if threads <= 1:
+            # No cloning needed for a single browser
+            work(self.automator.pool)
+        else:
+            # A warm Chrome on the profile locks (or is mid-write to) its cookie database
+            self.automator.pool.close()
+            workers = []
+            for index in range(threads):
+                profile_dir = self.clone_profile(index)
+                pool = DriverPool(
+                    lambda profile_dir=profile_dir: self.automator.get_driver(profile_dir),
+                    size=1, recycle_after=self.recycle_after
+                )
+                worker = threading.Thread(target=work, args=(pool,), daemon=True)
+                worker.start()
+                workers.append(worker)
+            for worker in workers:
+                worker.join()
+        
+        elapsed = time.perf_counter() - started
+        created = sum(1 for success, _ in results.values() if success)
+        return {
+            'results': results,
+            'threads': max(threads, 1),
+            'total': len(results),
+            'created': created,
+            'failed': len(results) - created,
+            'not_started': pending.qsize(),
+            'logged_out': logged_out.is_set(),
+            'elapsed': elapsed,
+            'per_minute': created / elapsed * 60 if elapsed else 0.0
+        }
+
+
+class BatchRunner:
+    """
+    Runs creation batches with a durable per-campaign checkpoint
+    Each submission is logged before it starts and each outcome as soon as it
+    returns, so after a crash resume() records every created URL and nothing
+    that may already exist on the site is submitted again
+    """
+    
+    # Submitted before a crash with no recorded outcome: check the site by hand
+    UNCONFIRMED = 'unconfirmed'
+    
+    def __init__(self, campaign_manager, checkpoint_path=None):
+        self.campaign_manager = campaign_manager
+        self.checkpoint = CampaignJournal(Path(checkpoint_path or BATCH_CHECKPOINT_PATH))
+        self._lock = threading.Lock()
+    
+    def _log(self, record):
+        with self._lock:
+            self.checkpoint.append(record)
+    
+    def resume(self):
+        """
+        Fold an interrupted run's checkpoint into the campaign data
+        Returns: {'recorded': campaigns given their URL, 'unconfirmed': [campaign_id, ...]}
+        """
+        records, _ = self.checkpoint.read()
+        if not records:
+            return {'recorded': 0, 'unconfirmed': []}
+        
+        started = set()
+        created = {}
+        finished = set()
+        for record in records:
+            campaign_id = record['campaign_id']
+            if record['event'] == 'started':
+                started.add(campaign_id)
+            elif record['event'] == 'finished':
+                finished.add(campaign_id)
+                if record['success']:
+                    created[campaign_id] = record['result']
+        
+        unconfirmed = sorted(started - finished)
+        updates = [
+            (campaign_id, {'whydonate_url': url, 'status': 'active'})
+            for campaign_id, url in created.items()
+        ]
+        updates += [(campaign_id, {'status': self.UNCONFIRMED}) for campaign_id in unconfirmed]
+        
+        with self._lock:
+            if updates and not self.campaign_manager.bulk_update(updates):
+                # Keep the checkpoint so the next resume can try again
+                return {'recorded': 0, 'unconfirmed': unconfirmed}
+            self.checkpoint.truncate()
+        
+        if unconfirmed:
+            print(f"⚠️ {len(unconfirmed)} campaign(s) were being submitted when the last "
+                  f"batch stopped; marked '{self.UNCONFIRMED}' - check Whydonate before retrying")
+        return {'recorded': len(created), 'unconfirmed': unconfirmed}
+    
+    def _unsubmitted(self, jobs):
+        """Drop jobs for campaigns that have a URL or an unconfirmed submission"""
+        df = self.campaign_manager.load_campaigns(['campaign_id', 'whydonate_url', 'status'])
+        if df.empty:
+            return list(jobs)
+        done = set(df.loc[df['whydonate_url'].notna() | (df['status'] == self.UNCONFIRMED),
+                          'campaign_id'])
+        return [(campaign_id, data) for campaign_id, data in jobs if campaign_id not in done]
+    
+    def run(self, jobs, creator, on_result=None):
+        """
+        Resume any interrupted run, then create the remaining jobs with creator
+        (a ParallelCampaignCreator); each URL is saved as soon as it is returned
+        Returns: creator's summary plus 'skipped', 'recorded' and 'unconfirmed'
+        """
+        recovered = self.resume()
+        remaining = self._unsubmitted(jobs)
+        saved = []
+        
+        def started(campaign_id):
+            self._log({'event': 'started', 'campaign_id': campaign_id})
+        
+        def finished(campaign_id, success, result):
+            self._log({'event': 'finished', 'campaign_id': campaign_id,
+                       'success': success, 'result': result})
+            if success:
+                with self._lock:
+                    saved.append(self.campaign_manager.update_campaign(
+                        campaign_id, {'whydonate_url': result, 'status': 'active'}
+                    ))
+            if on_result:
+                on_result(campaign_id, success, result)
+        
+        summary = creator.run(remaining, on_result=finished, on_start=started)
+        
+        # Every outcome is in the campaign data now; otherwise resume() retries
+        if all(saved):
+            with self._lock:
+                self.checkpoint.truncate()
+        
+        summary.update({
+            'skipped': len(jobs) - len(remaining),
+            'recorded': recovered['recorded'],
+            'unconfirmed': recovered['unconfirmed']
+        })
+        return summary
+
+
+class WhatsAppTemplates:
+    """WhatsApp templates from config.txt, compiled once for per-row or batch rendering"""
+    
+    # Used when config.txt has no whatsapp.templates
+    DEFAULT_TEMPLATES = {
+        "standard": """🌟 *{title}*
+
+Hi! I'm {name}. I've started a fundraising campaign and would appreciate your support!
+
+🔗 Campaign: {url}
+
+Thank you for considering!
+- {name}""",
+        
+        "urgent": """🚨 *URGENT: {title}*
+
+Hello, I'm {name}. We urgently need your help with our campaign.
+
+🔗 Please support: {url}
+
+Every contribution counts!
+- {name}""",
+        
+        "thank_you": """🙏 *Thank You!*
+
+This is {name}. Thank you for considering our campaign: {title}
+
+🔗 Learn more: {url}
+
+With gratitude,
+{name}"""
+    }
+    
+    # Template placeholders named differently in the campaign sheet
+    FIELD_COLUMNS = {'url': 'whydonate_url'}
+    
+    def __init__(self, templates=None, default_template="standard", hashtags=(),
+                 include_hashtags=True, include_link=True):
+        self.sources = {}
+        self.compiled = {}
+        for name, source in {**self.DEFAULT_TEMPLATES, **(templates or {})}.items():
+            if not include_link:
+                source = '\n'.join(line for line in source.split('\n') if '{url}' not in line)
+            try:
+                self.compiled[name] = self._compile(source)
+                self.sources[name] = source
+            except ValueError as e:
+                print(f"Invalid WhatsApp template '{name}': {e}")
+        
+        self.default_template = (default_template if default_template in self.compiled
+                                 else "standard")
+        self.suffix = ''
+        if include_hashtags and hashtags:
+            self.suffix = "\n\n" + ' '.join(f"#{str(tag).lstrip('#')}" for tag in hashtags)
+    
+    @classmethod
+    def from_config(cls, config):
+        """Build from the whatsapp section of config.txt"""
+        section = config.get('whatsapp', {})
+        return cls(
+            templates=section.get('templates') if section.get('enable_templates', True) else None,
+            default_template=section.get('default_template', "standard"),
+            hashtags=section.get('default_hashtags', ()),
+            include_hashtags=section.get('include_hashtags', True),
+            include_link=section.get('include_link', True)
+        )
+    
+    @classmethod
+    def _compile(cls, source):
+        """Split a str.format template into (literal, column, spec, conversion) parts"""
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"unsupported placeholder {{{field}}}")
+            column = cls.FIELD_COLUMNS.get(field, field) if field else None
+            parts.append((literal, column, spec, conversion))
+        return parts
+    
+    @property
+    def names(self):
+        return list(self.compiled)
+    
+    def resolve(self, template=None):
+        return template if template in self.compiled else self.default_template
+    
+    def source(self, template=None):
+        """Effective text of a template, hashtags included"""
+        return self.sources[self.resolve(template)] + self.suffix
     
-    def _submit_form(self, driver):
-        """Submit the form and return result"""
-        # Look for submit button
-        submit_texts = ['Publish', 'Create', 'Submit', 'Save']
-        
-        for text in submit_texts:
-            try:
-                button = driver.find_element(
-                    By.XPATH, f"//button[contains(text(), '{text}')]"
-                )
-                if button.is_displayed():
-                    button.click()
-                    time.sleep(10)
-                    
-                    # Check if successful
-                    if "/fundraiser/" in driver.current_url:
-                        return True, driver.current_url
-                    else:
-                        return False, "Submission failed - not redirected"
-            except:
+    def columns(self, template=None):
+        """Campaign columns a template reads, in order"""
+        parts = self.compiled[self.resolve(template)]
+        return tuple(dict.fromkeys(column for _, column, _, _ in parts if column))
+    
+    @staticmethod
+    def _text(value):
+        return '' if value is None or pd.isna(value) else str(value)
+    
+    def render(self, campaign, template=None):
+        """Message for one campaign (row or dict keyed by column)"""
+        formatter = string.Formatter()
+        pieces = []
+        for literal, column, spec, conversion in self.compiled[self.resolve(template)]:
+            pieces.append(literal)
+            if column is None:
                 continue
+            value = self._text(campaign.get(column))
+            if spec or conversion:
+                value = formatter.format_field(
+                    formatter.convert_field(value, conversion), spec or ''
+                )
+            pieces.append(value)
+        return ''.join(pieces) + self.suffix
+    
+    def render_many(self, df, template=None, escape=None):
+        """
+        Messages for every row of df as a Series, built column-wise
+        escape: optional str -> str (e.g. urllib's quote) applied as if to the
+        whole message, but run once per literal and once per field value
+        """
+        parts = self.compiled[self.resolve(template)]
+        if any(spec or conversion for _, _, spec, conversion in parts):
+            messages = pd.Series([self.render(row, template) for row in df.to_dict('records')],
+                                 index=df.index, dtype=object)
+            return messages.map(escape) if escape else messages
         
-        return False, "No submit button found"
+        escape = escape or (lambda text: text)
+        messages = pd.Series('', index=df.index, dtype=object)
+        for literal, column, _, _ in parts:
+            if literal:
+                messages = messages + escape(literal)
+            if column is None:
+                continue
+            if column in df.columns:
+                values = df[column].astype(object)
+                messages = messages + values.where(values.notna(), '').astype(str).map(escape)
+        return messages + escape(self.suffix)
 
 
 class TextProcessor:
     """Processes campaign text"""
     
+    # Bump when clean_text's rules change so stored results are redone
+    CLEAN_VERSION = 1
+    
+    # Derived columns and the campaign columns they are computed from
+    # (whatsapp_message reads whatever its template references)
+    DERIVED_INPUTS = {
+        'clean_text': ('presentation_text',),
+        'suggested_title': ('name', 'presentation_text')
+    }
+    
+    def __init__(self, templates=None):
+        self.templates = templates or WhatsAppTemplates()
+    
     @staticmethod
     def clean_text(text):
         """Clean and format campaign text"""
@@ -239,10 +2626,104 @@ class TextProcessor:
         
         return text
     
+    @staticmethod
+    def clean_series(texts):
+        """clean_text for a whole column, as vectorized string operations"""
+        texts = texts.astype(object).where(texts.notna(), '').astype(str)
+        cleaned = texts.str.replace(r'\s+', ' ', regex=True).str.strip()
+        
+        # Ensure proper punctuation
+        unterminated = cleaned.ne('') & ~cleaned.str.contains(r'[.!?]$', regex=True)
+        return cleaned.where(~unterminated, cleaned + '.')
+    
+    @staticmethod
+    def hash_column(field):
+        """Column holding the input hash a derived field was built from"""
+        return f"{field}_hash"
+    
+    @staticmethod
+    def content_hash(*values):
+        """Short stable hash of a derivation's inputs (NaN and '' hash alike)"""
+        text = '\x1f'.join('' if v is None or pd.isna(v) else str(v) for v in values)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+    
+    def input_columns(self, field, template=None):
+        if field == 'whatsapp_message':
+            return self.templates.columns(template)
+        return self.DERIVED_INPUTS[field]
+    
+    def derivation_salt(self, field, template=None):
+        """Everything besides the campaign's own columns that shapes a field"""
+        if field == 'clean_text':
+            return (field, self.CLEAN_VERSION)
+        if field == 'whatsapp_message':
+            return (field, self.templates.source(template))
+        return (field,)
+    
+    def input_hash(self, campaign, field, template=None):
+        """Input hash of one derived field for a campaign row or dict"""
+        values = [campaign.get(col) for col in self.input_columns(field, template)]
+        return self.content_hash(*self.derivation_salt(field, template), *values)
+    
+    def is_current(self, campaign, field, digest):
+        """
+        True if the stored field was derived from inputs hashing to digest
+        (an empty result, e.g. cleaning empty text, counts as derived)
+        """
+        return campaign.get(self.hash_column(field)) == digest
+    
+    def stale_rows(self, df, field, template=None):
+        """
+        Input hashes of rows whose field was never derived or was built from
+        other inputs (judged by the hash alone: empty results read back as NaN)
+        Returns: Series of new hashes, indexed like df
+        """
+        salt = self.derivation_salt(field, template)
+        columns = [
+            df[col].tolist() if col in df.columns else [None] * len(df)
+            for col in self.input_columns(field, template)
+        ]
+        digests = pd.Series(
+            [self.content_hash(*salt, *row) for row in zip(*columns)],
+            index=df.index, dtype=object
+        )
+        
+        hash_col = self.hash_column(field)
+        stale = pd.Series(True, index=df.index)
+        if hash_col in df.columns:
+            stale = digests.ne(df[hash_col].astype(object))
+        return digests[stale]
+    
+    def stale_clean_text(self, df):
+        """
+        Cleaned text for rows whose clean_text is missing or out of date
+        Returns: DataFrame of clean_text and its hash, indexed like df
+        """
+        digests = self.stale_rows(df, 'clean_text')
+        if 'presentation_text' in df.columns:
+            cleaned = self.clean_series(df.loc[digests.index, 'presentation_text'])
+        else:
+            cleaned = pd.Series('', index=digests.index, dtype=object)
+        return pd.DataFrame({'clean_text': cleaned, 'clean_text_hash': digests})
+    
+    def stale_whatsapp_messages(self, df, template=None):
+        """
+        Messages for created campaigns whose message is missing or out of date
+        Returns: DataFrame of whatsapp_message and its hash, indexed like df
+        """
+        if 'whydonate_url' not in df.columns:
+            return pd.DataFrame(columns=['whatsapp_message', 'whatsapp_message_hash'])
+        
+        created = df[df['whydonate_url'].notna() & df['whydonate_url'].astype(str).ne('')]
+        digests = self.stale_rows(created, 'whatsapp_message', template)
+        return pd.DataFrame({
+            'whatsapp_message': self.templates.render_many(created.loc[digests.index], template),
+            'whatsapp_message_hash': digests
+        })
+    
     @staticmethod
     def suggest_title(name, text):
         """Generate title suggestions"""
-        import random
         
         base_titles = [
             f"Support {name}'s Cause",
@@ -253,55 +2734,428 @@ class TextProcessor:
         
         return random.choice(base_titles)
     
-    @staticmethod
-    def generate_whatsapp_message(name, title, url, template="standard"):
+    def generate_whatsapp_message(self, name, title, url, template=None):
         """Generate WhatsApp message"""
-        templates = {
-            "standard": f"""🌟 *{title}*
-
-Hi! I'm {name}. I've started a fundraising campaign and would appreciate your support!
+        return self.templates.render(
+            {'name': name, 'title': title, 'whydonate_url': url}, template
+        )
 
-🔗 Campaign: {url}
 
-Thank you for considering!
-- {name}""",
+class WhatsAppExporter:
+    """Streams rendered WhatsApp messages for many campaigns to CSV or JSONL"""
+    
+    FIELDS = ['campaign_id', 'phone', 'message', 'wa_link']
+    
+    def __init__(self, campaign_manager, templates, export_dir=None):
+        self.campaign_manager = campaign_manager
+        self.templates = templates
+        self.export_dir = Path(export_dir or EXPORTS_DIR)
+    
+    @staticmethod
+    def _phone_digits(phones):
+        """International number as wa.me wants it: digits only, no 00 prefix"""
+        digits = phones.astype(object).where(phones.notna(), '').astype(str)
+        return digits.str.replace(r'\D', '', regex=True).str.replace(r'^00', '', regex=True)
+    
+    @classmethod
+    def wa_link(cls, phone, message):
+        """wa.me click-to-chat link (no number opens the contact picker)"""
+        digits = cls._phone_digits(pd.Series([phone])).iloc[0]
+        return f"https://wa.me/{digits}?text={quote(message)}"
+    
+    def rows(self, template=None, statuses=None, chunksize=1000):
+        """Yield export rows, one chunk of campaigns in memory at a time"""
+        columns = ['campaign_id', 'phone', 'whydonate_url', 'status',
+                   *self.templates.columns(template)]
+        for chunk in self.campaign_manager.iter_campaigns(chunksize, list(dict.fromkeys(columns))):
+            chunk = chunk[chunk['whydonate_url'].notna()
+                          & chunk['whydonate_url'].astype(str).ne('')]
+            if statuses:
+                chunk = chunk[chunk['status'].isin(statuses)]
+            if chunk.empty:
+                continue
             
-            "urgent": f"""🚨 *URGENT: {title}*
-
-Hello, I'm {name}. We urgently need your help with our campaign.
+            phones = chunk['phone']
+            messages = self.templates.render_many(chunk, template)
+            # Percent-encoding the template text once per chunk beats quoting every message
+            links = ("https://wa.me/" + self._phone_digits(phones) + "?text="
+                     + self.templates.render_many(chunk, template, escape=quote))
+            
+            for campaign_id, phone, message, link in zip(
+                chunk['campaign_id'], phones.astype(object).where(phones.notna(), ''),
+                messages, links
+            ):
+                yield {
+                    'campaign_id': campaign_id,
+                    'phone': str(phone),
+                    'message': message,
+                    'wa_link': link
+                }
+    
+    def export(self, fmt="csv", template=None, statuses=None, chunksize=1000, path=None):
+        """
+        Write messages for every created campaign (optionally only some statuses)
+        Returns: (path, number of rows written)
+        """
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown export format: {fmt}")
+        
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            name = self.templates.resolve(template)
+            path = self.export_dir / f"whatsapp_{name}_{stamp}.{fmt}"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        count = 0
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                rows = self.rows(template, statuses, chunksize)
+                if fmt == "csv":
+                    writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                    writer.writeheader()
+                    for row in rows:
+                        writer.writerow(row)
+                        count += 1
+                else:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                        count += 1
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return path, count
 
-🔗 Please support: {url}
 
-Every contribution counts!
-- {name}""",
+class AutomationWorker:
+    """Runs automation jobs on a background thread, reporting back through a queue"""
+    
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()
+        self.active = 0
+        self._thread = None
+    
+    def submit(self, job_id, func):
+        """
+        Queue func(report) to run in the background
+        report(message) posts a 'progress' event for job_id
+        """
+        self.active += 1
+        self.jobs.put((job_id, func))
+        
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
             
-            "thank_you": f"""🙏 *Thank You!*
+            job_id, func = job
+            self.events.put(('started', job_id, None))
+            try:
+                result = func(lambda message: self.events.put(('progress', job_id, message)))
+                self.events.put(('done', job_id, result))
+            except Exception as e:
+                self.events.put(('failed', job_id, e))
+    
+    def poll(self):
+        """Drain pending (kind, job_id, payload) events without blocking"""
+        events = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return events
+            if event[0] in ('done', 'failed'):
+                self.active -= 1
+            events.append(event)
+    
+    def stop(self):
+        """Let the worker exit after the queued jobs"""
+        self.jobs.put(None)
 
-This is {name}. Thank you for considering our campaign: {title}
 
-🔗 Learn more: {url}
+class CampaignListView:
+    """Campaign Treeview that diffs refreshes and can virtualize long lists"""
+    
+    COLUMNS = ('ID', 'Name', 'Title', 'Status', 'URL')
+    SOURCE_COLUMNS = ('campaign_id', 'name', 'title', 'status', 'whydonate_url')
+    DEFAULTS = ('', '', '', 'draft', 'Not created')
+    # What set_records needs from CampaignManager.list_rows
+    LIST_COLUMNS = SOURCE_COLUMNS + ('last_updated',)
+    
+    def __init__(self, parent, virtual=True, height=15):
+        self.virtual = virtual
+        self.visible = height
+        self.offset = 0
+        
+        # Column-oriented snapshot of the sheet
+        self.ids = []
+        self.iids = []
+        self.rows = []
+        self.stamps = []
+        self.positions = {}
+        self._shown = {}
+        self._selected = None
+        
+        self.tree = ttk.Treeview(parent, columns=self.COLUMNS, show='headings', height=height)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=150)
+        
+        # Scrollbars
+        hsb = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.tree.xview)
+        if virtual:
+            # The scrollbar tracks the whole sheet, not the materialized items
+            self.vsb = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._yview)
+            self.tree.configure(xscrollcommand=hsb.set)
+            for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+                self.tree.bind(sequence, self._on_wheel)
+            self.tree.bind('<Up>', lambda e: self._on_arrow(-1))
+            self.tree.bind('<Down>', lambda e: self._on_arrow(1))
+            self.tree.bind('<Configure>', self._on_resize)
+        else:
+            self.vsb = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self.vsb.set, xscrollcommand=hsb.set)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        
+        # Layout
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+    
+    def set_records(self, records):
+        """Take a new snapshot of list_rows() dicts and update only rows that changed"""
+        columns = [
+            [default if record.get(col) in (None, '') else str(record[col]) for record in records]
+            for col, default in zip(self.SOURCE_COLUMNS, self.DEFAULTS)
+        ]
+        self._set_snapshot(columns, [record.get('last_updated') for record in records])
+    
+    def _set_snapshot(self, columns, updated):
+        """Adopt per-column display values and update only rows that changed"""
+        self.ids = columns[0]
+        self.rows = list(zip(*columns))
+        self.stamps = list(zip(updated, self.rows))
+        
+        # Treeview item IDs must be unique, even for duplicate/blank campaign IDs
+        self.iids = []
+        seen = set()
+        for pos, campaign_id in enumerate(self.ids):
+            iid = campaign_id or f"row-{pos}"
+            if iid in seen:
+                iid = f"{iid}#{pos}"
+            seen.add(iid)
+            self.iids.append(iid)
+        self.positions = {iid: pos for pos, iid in enumerate(self.iids)}
+        
+        self.offset = min(self.offset, max(0, len(self.rows) - self.visible))
+        self._sync()
+    
+    def selected_campaign_id(self):
+        """campaign_id of the selected row, or None"""
+        pos = self.positions.get(self._selected)
+        return self.ids[pos] if pos is not None else None
+    
+    def selected_campaign_ids(self):
+        """campaign_ids of all selected rows"""
+        iids = list(self.tree.selection()) or [self._selected]
+        return [self.ids[self.positions[iid]] for iid in iids if iid in self.positions]
+    
+    def _window(self):
+        """Range of row positions that should exist as Treeview items"""
+        if not self.virtual:
+            return 0, len(self.rows)
+        return self.offset, min(len(self.rows), self.offset + self.visible)
+    
+    def _sync(self):
+        """Bring Treeview items in line with the snapshot window"""
+        start, end = self._window()
+        want = self.iids[start:end]
+        want_set = set(want)
+        
+        current = self.tree.get_children()
+        stale = [iid for iid in current if iid not in want_set]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                self._shown.pop(iid, None)
+        
+        kept = [iid for iid in current if iid in want_set]
+        kept_set = set(kept)
+        in_order = kept == [iid for iid in want if iid in kept_set]
+        
+        for index, iid in enumerate(want):
+            pos = start + index
+            if iid not in kept_set:
+                self.tree.insert('', index, iid=iid, values=self.rows[pos])
+            else:
+                if self._shown.get(iid) != self.stamps[pos]:
+                    self.tree.item(iid, values=self.rows[pos])
+                if not in_order:
+                    self.tree.move(iid, '', index)
+            self._shown[iid] = self.stamps[pos]
+        
+        if self._selected in want_set and self._selected not in self.tree.selection():
+            self.tree.selection_set(self._selected)
+        
+        if self.virtual:
+            total = max(len(self.rows), 1)
+            self.vsb.set(start / total, max(end, start + 1) / total if self.rows else 1)
+    
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.rows) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._sync()
+    
+    def _yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)"""
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self._scroll_to(self.offset + int(args[1]) * step)
+    
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self._scroll_to(self.offset - 3)
+        else:
+            self._scroll_to(self.offset + 3)
+        return "break"
+    
+    def _on_arrow(self, step):
+        """Scroll when the keyboard moves past the materialized window"""
+        pos = self.positions.get(self.tree.focus())
+        start, end = self._window()
+        if pos is None or start <= pos + step < end:
+            return None
+        
+        target = pos + step
+        if 0 <= target < len(self.rows):
+            self._scroll_to(self.offset + step)
+            iid = self.iids[target]
+            self.tree.focus(iid)
+            self.tree.selection_set(iid)
+        return "break"
+    
+    def _on_resize(self, event):
+        """Materialize as many rows as fit in the widget"""
+        first = self.tree.get_children()[:1]
+        bbox = self.tree.bbox(first[0]) if first else None
+        if bbox:
+            visible = max(1, (event.height - bbox[1]) // bbox[3])
+            if visible != self.visible:
+                self.visible = visible
+                self.offset = max(0, min(self.offset, len(self.rows) - visible))
+                self._sync()
+    
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self._selected = selection[0]
 
-With gratitude,
-{name}"""
-        }
+
+class StartupTimer:
+    """Time from interpreter start to each startup phase, printed once"""
+    
+    HEAVY_MODULES = ('pandas', 'selenium')
+    
+    def __init__(self, started=None):
+        self.started = started or STARTED
+        self.marks = []
+    
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter()))
+    
+    def report(self):
+        """Print per-phase and total times; returns them in milliseconds"""
+        timings = {}
+        previous = self.started
+        print("\n⏱️  Startup timing")
+        for phase, at in self.marks:
+            timings[phase] = round((at - previous) * 1000, 1)
+            print(f"   {phase:<16} {timings[phase]:8.1f} ms")
+            previous = at
         
-        return templates.get(template, templates["standard"])
+        total = round((previous - self.started) * 1000, 1)
+        loaded = [name for name in self.HEAVY_MODULES if name in sys.modules]
+        print(f"   {'total':<16} {total:8.1f} ms")
+        print(f"   heavy modules loaded: {', '.join(loaded) or 'none'}")
+        return {'phases': timings, 'total': total, 'loaded': loaded}
 
 
 class DeskAgentGUI:
     """Main GUI application"""
     
-    def __init__(self):
-        self.campaign_manager = CampaignManager()
-        self.automator = WhydonateAutomator()
-        self.text_processor = TextProcessor()
+    def __init__(self, startup=None):
+        self.startup = startup or StartupTimer()
+        self.config = load_config()
+        csv_config = self.config.get('csv', {})
+        self.campaign_manager = CampaignManager(
+            backend=csv_config.get('backend', 'csv'),
+            journaled=csv_config.get('journaled', False),
+            compact_threshold=csv_config.get('compact_threshold', 500)
+        )
+        whydonate_config = self.config.get('whydonate', {})
+        self.automator = WhydonateAutomator(
+            recycle_after=whydonate_config.get('recycle_after', 25),
+            timeout=whydonate_config.get('timeout', 30),
+            fast_fill=whydonate_config.get('fast_fill', True),
+            site=SITE_DRIVERS.get(whydonate_config.get('site'), WhydonateSite)(
+                whydonate_config.get('base_url')
+            )
+        )
+        self.session_probe = SessionProbe(
+            domain=urlparse(self.automator.site.base_url).hostname,
+            browser_check=self.automator.test_connection,
+            ttl=whydonate_config.get('probe_ttl', 300),
+            snapshot_max_age=self.automator.session_max_age
+        )
+        self.automator.on_logged_out = self.session_probe.invalidate
+        self.text_processor = TextProcessor(WhatsAppTemplates.from_config(self.config))
+        self.worker = AutomationWorker()
+        self.batch_runner = BatchRunner(self.campaign_manager)
+        self._queued_ids = set()
+        self._batch_ids = set()
+        self.startup.mark("services")
         
         self.root = tk.Tk()
         self.root.title("DeskAgent v1")
         self.root.geometry("1100x700")
         
         self._setup_ui()
+        self.startup.mark("window built")
+        self._show_session_state()
+        self.root.after(100, self._poll_worker)
+        # Fill the list once the window is on screen
+        self.root.after(0, self._finish_startup)
+    
+    def _finish_startup(self):
+        """Load campaigns after the first paint and print the timing report"""
+        self.root.update_idletasks()
+        self.startup.mark("first paint")
+        self._resume_batch()
         self._load_data()
+        self.startup.mark("campaign list")
+        self.startup.report()
+    
+    def _resume_batch(self):
+        """Record the results of a batch that was interrupted by a crash"""
+        if not self.batch_runner.checkpoint.count:
+            return
+        recovered = self.batch_runner.resume()
+        message = f"Recovered {recovered['recorded']} campaign URL(s) from an interrupted batch"
+        if recovered['unconfirmed']:
+            message += (f"\n{len(recovered['unconfirmed'])} campaign(s) were mid-submission and are "
+                        f"marked '{BatchRunner.UNCONFIRMED}' - check Whydonate before retrying")
+        self._show_info(message)
     
     def _setup_ui(self):
         """Setup the user interface"""
@@ -334,22 +3188,10 @@ class DeskAgentGUI:
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Treeview
-        columns = ('ID', 'Name', 'Title', 'Status', 'URL')
-        self.tree = ttk.Treeview(frame, columns=columns, show='headings', height=15)
-        
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150)
-        
-        # Scrollbars
-        vsb = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
-        hsb = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        
-        # Layout
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        vsb.grid(row=0, column=1, sticky='ns')
-        hsb.grid(row=1, column=0, sticky='ew')
+        self.campaign_list = CampaignListView(
+            frame, virtual=self.config.get('ui', {}).get('virtual_list', True)
+        )
+        self.tree = self.campaign_list.tree
         
         frame.grid_rowconfigure(0, weight=1)
         frame.grid_columnconfigure(0, weight=1)
@@ -364,6 +3206,8 @@ class DeskAgentGUI:
                   command=self._load_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Clean Text", 
                   command=self._clean_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Clean All", 
+                  command=self._clean_all).pack(side=tk.LEFT, padx=5)
     
     def _create_automation_tab(self):
         """Create Whydonate automation tab"""
@@ -396,6 +3240,8 @@ class DeskAgentGUI:
                   command=self._test_connection).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Create Selected", 
                   command=self._create_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Create All Pending", 
+                  command=self._create_all_pending).pack(side=tk.LEFT, padx=5)
         
         # Progress
         self.progress = ttk.Progressbar(tab, mode='indeterminate')
@@ -417,30 +3263,30 @@ class DeskAgentGUI:
         btn_frame = ttk.Frame(tab)
         btn_frame.pack(fill=tk.X, padx=10, pady=10)
         
+        templates = self.text_processor.templates
+        ttk.Label(btn_frame, text="Template:").pack(side=tk.LEFT, padx=(5, 0))
+        self.template_var = tk.StringVar(value=templates.default_template)
+        ttk.Combobox(btn_frame, textvariable=self.template_var, values=templates.names,
+                     state='readonly', width=12).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(btn_frame, text="Generate", 
                   command=self._generate_message).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Generate All", 
+                  command=self._generate_all_messages).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Copy", 
                   command=self._copy_message).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Export CSV", 
+                  command=lambda: self._export_messages("csv")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Export JSONL", 
+                  command=lambda: self._export_messages("jsonl")).pack(side=tk.LEFT, padx=5)
     
     def _load_data(self):
         """Load campaigns into treeview"""
-        # Clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         try:
-            df = self.campaign_manager.load_campaigns()
+            rows = self.campaign_manager.list_rows(CampaignListView.LIST_COLUMNS)
+            self.campaign_list.set_records(rows)
             
-            for _, row in df.iterrows():
-                self.tree.insert('', 'end', values=(
-                    row.get('campaign_id', ''),
-                    row.get('name', ''),
-                    row.get('title', ''),
-                    row.get('status', 'draft'),
-                    row.get('whydonate_url', 'Not created')
-                ))
-            
-            self._update_status(f"Loaded {len(df)} campaigns")
+            self._update_status(f"Loaded {len(rows)} campaigns")
             
         except Exception as e:
             self._show_error(f"Failed to load data: {e}")
@@ -491,101 +3337,212 @@ class DeskAgentGUI:
         
         ttk.Button(dialog, text="Save", command=save).grid(row=len(fields), column=1, pady=10)
     
+    def _show_session_state(self):
+        """Instant connection indicator from cached/local session evidence"""
+        state = self.session_probe.probe(allow_browser=False)
+        if state['logged_in'] is None:
+            self.connection_label.config(text="Not tested")
+        elif state['logged_in']:
+            self.connection_label.config(text=f"✅ Session valid ({state['source']})")
+        else:
+            self.connection_label.config(text=f"❌ Session expired ({state['source']}) - log in again")
+    
     def _test_connection(self):
         """Test Whydonate connection"""
         self._update_status("Testing connection...")
+        self.worker.submit(
+            ('test', None), lambda report: self.session_probe.probe(force=True)['logged_in']
+        )
         self.progress.start()
-        
-        try:
-            connected = self.automator.test_connection()
-            
-            if connected:
-                self.connection_label.config(text="✅ Connected to Whydonate")
-                self._update_status("Connection successful")
-            else:
-                self.connection_label.config(text="❌ Not connected")
-                self._update_status("Connection failed - check VPN/login")
-                
-        except Exception as e:
-            self.connection_label.config(text="❌ Error testing connection")
-            self._show_error(f"Connection test failed: {e}")
-        finally:
-            self.progress.stop()
     
     def _create_selected(self):
-        """Create selected campaign on Whydonate"""
-        selection = self.tree.selection()
-        if not selection:
+        """Queue selected campaigns for creation on Whydonate"""
+        campaign_ids = self.campaign_list.selected_campaign_ids()
+        if not campaign_ids:
             self._show_warning("Select a campaign first")
             return
         
-        item = self.tree.item(selection[0])
-        campaign_id = item['values'][0]
+        for campaign_id in campaign_ids:
+            if campaign_id in self._queued_ids:
+                continue
+            
+            campaign = self.campaign_manager.get_campaign(campaign_id)
+            if campaign is None:
+                self._show_warning(f"Campaign {campaign_id} not found")
+                continue
+            
+            try:
+                campaign_data = self.automator.campaign_payload(campaign)
+            except ValueError as e:
+                self._show_warning(f"Campaign {campaign_id} skipped: {e}")
+                continue
+            
+            self._queued_ids.add(campaign_id)
+            self.worker.submit(
+                ('create', campaign_id),
+                lambda report, data=campaign_data: self.automator.create_campaign(
+                    data, progress=report
+                )
+            )
         
-        self._update_status(f"Creating campaign {campaign_id}...")
+        self._update_status(f"{self.worker.active} automation job(s) queued")
         self.progress.start()
+    
+    def _create_all_pending(self):
+        """Create every pending campaign, in parallel when enabled in config"""
+        pending = self.campaign_manager.pending_campaigns()
+        jobs = []
+        invalid = []
+        for _, row in pending.iterrows():
+            if row['campaign_id'] in self._queued_ids:
+                continue
+            try:
+                jobs.append((row['campaign_id'], self.automator.campaign_payload(row)))
+            except ValueError as e:
+                invalid.append(f"{row['campaign_id']}: {e}")
+        if invalid:
+            self._show_warning(f"{len(invalid)} campaign(s) skipped:\n" + "\n".join(invalid[:10]))
+        if not jobs:
+            self._show_info("No pending campaigns to create")
+            return
         
-        try:
-            df = self.campaign_manager.load_campaigns()
-            campaign = df[df['campaign_id'] == campaign_id].iloc[0]
-            
-            campaign_data = {
-                'title': campaign.get('title', ''),
-                'description': campaign.get('clean_text', campaign.get('presentation_text', '')),
-                'category': campaign.get('category', 'General'),
-                'target_amount': float(campaign.get('target_amount', 1000))
-            }
-            
-            success, result = self.automator.create_campaign(campaign_data)
+        advanced = self.config.get('advanced', {})
+        threads = advanced.get('max_threads', 3) if advanced.get('multi_threading') else 1
+        creator = ParallelCampaignCreator(
+            self.automator, max_threads=threads,
+            recycle_after=self.config.get('whydonate', {}).get('recycle_after', 25)
+        )
+        
+        def job(report):
+            return self.batch_runner.run(
+                jobs, creator, on_result=lambda campaign_id, success, result: report(
+                    f"{'created' if success else 'failed'}: {result}"
+                )
+            )
+        
+        self._batch_ids = {campaign_id for campaign_id, _ in jobs}
+        self._queued_ids.update(self._batch_ids)
+        self.worker.submit(('batch', None), job)
+        self._update_status(f"Creating {len(jobs)} pending campaigns with {threads} browser(s)...")
+        self.progress.start()
+    
+    def _poll_worker(self):
+        """Apply automation results on the Tk thread"""
+        for kind, (job, campaign_id), payload in self.worker.poll():
+            try:
+                if kind == 'started' and job == 'create':
+                    self._update_status(f"Creating campaign {campaign_id}...")
+                elif kind == 'progress':
+                    self._update_status(f"{campaign_id or 'Whydonate'}: {payload}")
+                elif kind == 'done' and job == 'test':
+                    self._on_connection_tested(payload)
+                elif kind == 'done' and job == 'create':
+                    self._on_campaign_created(campaign_id, *payload)
+                elif kind == 'done' and job == 'batch':
+                    self._on_batch_finished(payload)
+                elif kind == 'failed':
+                    self._queued_ids.discard(campaign_id)
+                    if job == 'batch':
+                        self._queued_ids.difference_update(self._batch_ids)
+                    if job == 'test':
+                        self.connection_label.config(text="❌ Error testing connection")
+                        self._show_error(f"Connection test failed: {payload}")
+                    else:
+                        self._show_error(f"Error: {payload}")
+            except Exception as e:
+                self._show_error(f"Error: {e}")
+        
+        if not self.worker.active:
+            self.progress.stop()
+        self.root.after(100, self._poll_worker)
+    
+    def _on_connection_tested(self, connected):
+        """Show the connection test result"""
+        if connected:
+            self.connection_label.config(text="✅ Connected to Whydonate")
+            self._update_status("Connection successful")
+        else:
+            self.connection_label.config(text="❌ Not connected")
+            self._update_status("Connection failed - check VPN/login")
+    
+    def _on_batch_finished(self, summary):
+        """Show a batch's results (the runner saved each one as it finished)"""
+        self._queued_ids.difference_update(self._batch_ids)
+        self._load_data()
+        message = (
+            f"Created {summary['created']} of {summary['total']} campaigns "
+            f"({summary['failed']} failed) in {summary['elapsed']:.0f}s "
+            f"using {summary['threads']} browser(s) - "
+            f"{summary['per_minute']:.1f} campaigns/min"
+        )
+        if summary['skipped']:
+            message += f"\nSkipped {summary['skipped']} already submitted"
+        if summary['logged_out']:
+            message += (f"\nStopped: not logged in - {summary['not_started']} campaign(s) "
+                        f"left pending; log in and run the batch again")
+        if summary['unconfirmed']:
+            message += (f"\n{len(summary['unconfirmed'])} campaign(s) from an interrupted batch "
+                        f"are marked '{BatchRunner.UNCONFIRMED}' - check Whydonate")
+        self._show_info(message)
+    
+    def _on_campaign_created(self, campaign_id, success, result):
+        """Record a finished creation job"""
+        self._queued_ids.discard(campaign_id)
+        
+        if success:
+            # Update with URL
+            self.campaign_manager.update_campaign(campaign_id, {
+                'whydonate_url': result,
+                'status': 'active'
+            })
             
-            if success:
-                # Update with URL
-                self.campaign_manager.update_campaign(campaign_id, {
-                    'whydonate_url': result,
-                    'status': 'active'
-                })
-                
-                self._update_status(f"Campaign created: {result}")
-                self._load_data()
+            self._update_status(f"Campaign created: {result}")
+            self._load_data()
+            if not self.worker.active:
                 self._show_info("Campaign created successfully!")
-            else:
-                self._update_status(f"Creation failed: {result}")
-                self._show_error(f"Failed to create campaign: {result}")
-                
-        except Exception as e:
-            self._show_error(f"Error: {e}")
-        finally:
-            self.progress.stop()
+        else:
+            self._update_status(f"Creation failed: {result}")
+            self._show_error(f"Failed to create campaign {campaign_id}: {result}")
     
     def _clean_selected(self):
         """Clean text of selected campaign"""
-        selection = self.tree.selection()
-        if not selection:
+        campaign_id = self.campaign_list.selected_campaign_id()
+        if campaign_id is None:
             self._show_warning("Select a campaign first")
             return
         
-        item = self.tree.item(selection[0])
-        campaign_id = item['values'][0]
-        
         try:
-            df = self.campaign_manager.load_campaigns()
-            campaign = df[df['campaign_id'] == campaign_id].iloc[0]
+            campaign = self.campaign_manager.get_campaign(campaign_id)
+            if campaign is None:
+                self._show_warning(f"Campaign {campaign_id} not found")
+                return
             
             text = campaign.get('presentation_text', '')
             if pd.isna(text) or not text:
                 self._show_warning("No text to clean")
                 return
             
-            cleaned = self.text_processor.clean_text(text)
-            suggested = self.text_processor.suggest_title(
-                campaign.get('name', ''), cleaned
-            )
+            # Only redo fields whose inputs changed since they were derived
+            updates = {}
+            cleaned = campaign.get('clean_text')
+            digest = self.text_processor.input_hash(campaign, 'clean_text')
+            if not self.text_processor.is_current(campaign, 'clean_text', digest):
+                cleaned = self.text_processor.clean_text(text)
+                updates.update(clean_text=cleaned, clean_text_hash=digest)
+            
+            digest = self.text_processor.input_hash(campaign, 'suggested_title')
+            if not self.text_processor.is_current(campaign, 'suggested_title', digest):
+                updates['suggested_title'] = self.text_processor.suggest_title(
+                    campaign.get('name', ''), cleaned
+                )
+                updates['suggested_title_hash'] = digest
+            
+            if not updates:
+                self._update_status("Text already clean")
+                return
             
             # Update
-            self.campaign_manager.update_campaign(campaign_id, {
-                'clean_text': cleaned,
-                'suggested_title': suggested
-            })
+            self.campaign_manager.update_campaign(campaign_id, updates)
             
             self._update_status("Text cleaned")
             self._load_data()
@@ -593,31 +3550,53 @@ class DeskAgentGUI:
         except Exception as e:
             self._show_error(f"Error cleaning text: {e}")
     
+    def _clean_all(self):
+        """Clean text of every campaign whose clean_text is missing or stale"""
+        try:
+            df = self.campaign_manager.load_campaigns()
+            cleaned = self.text_processor.stale_clean_text(df)
+            ids = df.loc[cleaned.index, 'campaign_id']
+            
+            updated = self.campaign_manager.bulk_update(
+                (campaign_id, updates)
+                for campaign_id, updates in zip(ids, cleaned.to_dict('records'))
+                if not pd.isna(campaign_id)
+            )
+            
+            self._update_status(f"Cleaned text of {updated} campaigns")
+            if updated:
+                self._load_data()
+            
+        except Exception as e:
+            self._show_error(f"Error cleaning text: {e}")
+    
     def _generate_message(self):
         """Generate WhatsApp message"""
-        selection = self.tree.selection()
-        if not selection:
+        campaign_id = self.campaign_list.selected_campaign_id()
+        if campaign_id is None:
             self._show_warning("Select a campaign first")
             return
         
-        item = self.tree.item(selection[0])
-        campaign_id = item['values'][0]
-        
         try:
-            df = self.campaign_manager.load_campaigns()
-            campaign = df[df['campaign_id'] == campaign_id].iloc[0]
+            campaign = self.campaign_manager.get_campaign(campaign_id)
+            if campaign is None:
+                self._show_warning(f"Campaign {campaign_id} not found")
+                return
             
-            name = campaign.get('name', '')
-            title = campaign.get('title', '')
             url = campaign.get('whydonate_url', '')
-            
             if not url or pd.isna(url):
                 self._show_warning("Create campaign on Whydonate first")
                 return
             
-            message = self.text_processor.generate_whatsapp_message(
-                name, title, url
-            )
+            template = self.template_var.get()
+            message = campaign.get('whatsapp_message')
+            digest = self.text_processor.input_hash(campaign, 'whatsapp_message', template)
+            if not self.text_processor.is_current(campaign, 'whatsapp_message', digest):
+                message = self.text_processor.templates.render(campaign, template)
+                self.campaign_manager.update_campaign(campaign_id, {
+                    'whatsapp_message': message,
+                    'whatsapp_message_hash': digest
+                })
             
             self.message_display.delete(1.0, tk.END)
             self.message_display.insert(1.0, message)
@@ -625,6 +3604,35 @@ class DeskAgentGUI:
         except Exception as e:
             self._show_error(f"Error generating message: {e}")
     
+    def _generate_all_messages(self):
+        """Generate WhatsApp messages for created campaigns that lack a current one"""
+        try:
+            df = self.campaign_manager.load_campaigns()
+            messages = self.text_processor.stale_whatsapp_messages(df, self.template_var.get())
+            ids = df.loc[messages.index, 'campaign_id']
+            
+            updated = self.campaign_manager.bulk_update(
+                (campaign_id, updates)
+                for campaign_id, updates in zip(ids, messages.to_dict('records'))
+                if not pd.isna(campaign_id)
+            )
+            self._update_status(f"Generated {updated} WhatsApp messages")
+            
+        except Exception as e:
+            self._show_error(f"Error generating messages: {e}")
+    
+    def _export_messages(self, fmt):
+        """Export messages for all created campaigns to data/exports"""
+        try:
+            self._update_status("Exporting WhatsApp messages...")
+            exporter = WhatsAppExporter(self.campaign_manager, self.text_processor.templates)
+            path, count = exporter.export(fmt, self.template_var.get())
+            self._update_status(f"Exported {count} messages")
+            self._show_info(f"Exported {count} messages to:\n{path}")
+            
+        except Exception as e:
+            self._show_error(f"Error exporting messages: {e}")
+    
     def _copy_message(self):
         """Copy message to clipboard"""
         message = self.message_display.get(1.0, tk.END).strip()
@@ -657,6 +3665,11 @@ class DeskAgentGUI:
         """Run the application"""
         self._update_status("DeskAgent v1 Ready")
         self.root.mainloop()
+        self.worker.stop()
+        self.automator.close()
+        
+        # Keep campaigns_master.csv in sync with the database/journal
+        self.campaign_manager.close()
 
 
 def main():
@@ -669,7 +3682,9 @@ def main():
     print(f"Chrome profile: {PROFILE_DIR}")
     print("="*60)
     
-    app = DeskAgentGUI()
+    startup = StartupTimer()
+    startup.mark("imports")
+    app = DeskAgentGUI(startup)
     app.run()
 
 
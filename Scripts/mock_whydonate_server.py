@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Whydonate
+Serves login, dashboard, create-form and success pages so campaign creation
+can be run and benchmarked offline, with configurable latency and failures.
+Set whydonate.site to "mock" and whydonate.base_url to http://127.0.0.1:8765
+in data/config.txt to point DeskAgent at it.
+"""
+
+import argparse
+import base64
+import html
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_token(lifetime=3600):
+    """Unsigned JWT-shaped token with an exp claim"""
+    def encode(data):
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+    header = encode({"alg": "none", "typ": "JWT"})
+    payload = encode({"sub": "mock-user", "exp": int(time.time() + lifetime)})
+    return f"{header}.{payload}.mock"
+
+
+def token_is_valid(token):
+    """Check the exp claim of a token issued by make_token"""
+    try:
+        payload = token.split('.')[1]
+        data = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return data.get('exp', 0) > time.time()
+    except (IndexError, ValueError):
+        return False
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - Mock Whydonate</title></head>
+<body>
+<h1>{title}</h1>
+{body}
+</body></html>"""
+
+LOGIN_FORM = """<form method="post" action="/account/login">
+  <input id="loginEmail" name="email" type="email" placeholder="Email">
+  <input id="loginPassword" name="password" type="password" placeholder="Password">
+  <button type="submit">Login</button>
+</form>"""
+
+
+CREATE_FORM = """{error}<form method="post" action="/en/fundraiser/create">
+  <input name="title" type="text" placeholder="Title">
+  <select name="category">
+    <option value="General">General</option>
+    <option value="Emergency relief">Emergency relief</option>
+    <option value="Medical">Medical</option>
+    <option value="Education">Education</option>
+    <option value="Animals">Animals</option>
+  </select>
+  <textarea name="description" placeholder="Description"></textarea>
+  <input name="goal_amount" type="number" placeholder="Goal_Amount">
+  <button type="submit">Create</button>
+</form>"""
+
+COOKIE_BANNER = """<div id="cookie-banner">
+  <p>We use cookies.</p>
+  <button onclick="document.cookie='cookie_consent=1; path=/'; document.getElementById('cookie-banner').remove()">Accept</button>
+</div>"""
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:60] or 'campaign'
+
+
+class MockWhydonateHandler(BaseHTTPRequestHandler):
+    """Request handler; settings live on the server object"""
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _token(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return cookie['token'].value if 'token' in cookie else ''
+
+    def _logged_in(self):
+        return not self.server.require_login or token_is_valid(self._token())
+
+    def _delay(self):
+        """Simulated server latency"""
+        latency = self.server.latency
+        if self.server.jitter:
+            latency += random.uniform(-self.server.jitter, self.server.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _send_page(self, title, body, status=200, headers=None):
+        if self.server.cookie_banner and self._needs_banner():
+            body = COOKIE_BANNER + body
+        content = PAGE.format(title=title, body=body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _redirect(self, location, headers=None):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _needs_banner(self):
+        return 'cookie_consent' not in SimpleCookie(self.headers.get('Cookie', ''))
+
+    def _send_json(self, data):
+        content = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+
+        if path == '/__stats':
+            return self._send_json(self.server.stats())
+        self._delay()
+
+        if path in ('/', '/en', '/en/'):
+            self._send_page("Home", '<a href="/en/dashboard">Dashboard</a>')
+        elif path == '/account/login':
+            self._send_page("Login", LOGIN_FORM)
+        elif path == '/en/dashboard':
+            if not self._logged_in():
+                return self._redirect('/account/login')
+            # Mirror the real site's SPA, which keeps its token in localStorage
+            script = f"<script>localStorage.setItem('token', {json.dumps(self._token())});</script>"
+            self._send_page("Dashboard", "<p>Welcome back</p>" + script)
+        elif path == '/en/fundraiser/create':
+            if not self._logged_in():
+                return self._redirect('/account/login')
+            error = parse_qs(url.query).get('error', [''])[0]
+            notice = f'<p class="error">{html.escape(error)}</p>' if error else ''
+            self._send_page("Create Fundraiser", CREATE_FORM.format(error=notice))
+        elif path.startswith('/en/fundraiser/'):
+            campaign = self.server.campaigns.get(path.rsplit('/', 1)[-1])
+            if campaign is None:
+                return self._send_page("Not Found", "<p>Fundraiser not found</p>", status=404)
+            self._send_page(
+                html.escape(campaign.get('title', '')),
+                f"<p>{html.escape(campaign.get('description', ''))}</p>"
+                f"<p>Goal: {html.escape(campaign.get('goal_amount', ''))}</p>"
+            )
+        elif path == '/account/logout':
+            self._redirect('/account/login', {'Set-Cookie': 'token=; Path=/; Max-Age=0'})
+        else:
+            self._send_page("Not Found", "<p>Page not found</p>", status=404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get('Content-Length', 0))
+        form = {
+            key: values[0]
+            for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()
+        }
+        self._delay()
+
+        if path == '/account/login':
+            token = make_token(self.server.token_lifetime)
+            expires = time.strftime(
+                '%a, %d %b %Y %H:%M:%S GMT',
+                time.gmtime(time.time() + self.server.token_lifetime)
+            )
+            self._redirect('/en/dashboard', {
+                'Set-Cookie': f'token={token}; Path=/; Expires={expires}'
+            })
+        elif path == '/en/fundraiser/create':
+            if not self._logged_in():
+                return self._redirect('/account/login')
+            if not form.get('title'):
+                self.server.record('failed')
+                return self._redirect('/en/fundraiser/create?error=Title+is+required')
+            if random.random() < self.server.failure_rate:
+                self.server.record('failed')
+                return self._redirect('/en/fundraiser/create?error=Something+went+wrong')
+            slug = self.server.add_campaign(form)
+            self._redirect(f'/en/fundraiser/{slug}')
+        else:
+            self._send_page("Not Found", "<p>Page not found</p>", status=404)
+
+
+class MockWhydonateServer(ThreadingHTTPServer):
+    """HTTP server holding the mock's settings, campaigns and counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, failure_rate=0.0,
+                 require_login=True, cookie_banner=False, token_lifetime=3600,
+                 verbose=False):
+        super().__init__(address, MockWhydonateHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.require_login = require_login
+        self.cookie_banner = cookie_banner
+        self.token_lifetime = token_lifetime
+        self.verbose = verbose
+        self.campaigns = {}
+        self.counts = {'created': 0, 'failed': 0}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def add_campaign(self, form):
+        """Store a created campaign and return its slug"""
+        with self._lock:
+            slug = f"{slugify(form.get('title', ''))}-{next(self._ids)}"
+            self.campaigns[slug] = form
+            self.counts['created'] += 1
+        return slug
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+def create_server(host="127.0.0.1", port=8765, **settings):
+    """
+    Build the mock server (port 0 picks a free port)
+    settings: latency, jitter, failure_rate, require_login, cookie_banner,
+              token_lifetime, verbose
+    """
+    return MockWhydonateServer((host, port), **settings)
+
+
+def serve_in_background(**settings):
+    """Start a mock server on a free port in a daemon thread; returns the server"""
+    server = create_server(port=settings.pop('port', 0), **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for Whydonate")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="seconds added to every page response")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="random +/- seconds around --latency")
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help="fraction (0-1) of submissions that fail")
+    parser.add_argument('--no-login', action='store_true',
+                        help="serve every page as if logged in")
+    parser.add_argument('--cookie-banner', action='store_true',
+                        help="show a cookie banner until it is dismissed")
+    parser.add_argument('--token-lifetime', type=int, default=3600,
+                        help="seconds until a login expires")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = create_server(
+        args.host, args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        require_login=not args.no_login,
+        cookie_banner=args.cookie_banner,
+        token_lifetime=args.token_lifetime,
+        verbose=args.verbose
+    )
+    print(f"Mock Whydonate running at {server.base_url}")
+    print(f"Stats: {server.base_url}/__stats")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
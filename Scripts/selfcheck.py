@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+DeskAgent offline self-check
+Exercises the crash-safety paths of the campaign store in scratch
+directories: journal replay, torn journal lines, interrupted compaction,
+the CSV append path, the ID allocator, SQLite/CSV sync, a locked
+sheet and batch resume.
+Needs no browser or network; exits non-zero if any check fails.
+
+    python Scripts/selfcheck.py
+"""
+
+import sys
+import tempfile
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import deskagent_v1 as deskagent
+from benchmark import synthetic_campaigns, use_data_dir
+
+
+def fresh_sheet(directory, rows=20, **columns):
+    """Point DeskAgent at directory and write a synthetic campaigns_master.csv"""
+    use_data_dir(directory)
+    df = synthetic_campaigns(rows)
+    for column, value in columns.items():
+        df[column] = value
+    df.to_csv(deskagent.CSV_PATH, index=False)
+    return df
+
+
+def snapshot(manager):
+    """Comparable copy of everything the manager would load"""
+    df = manager.load_campaigns().drop(columns=['last_updated'])
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def check_replay_is_idempotent(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager(journaled=True, compact_threshold=10 ** 6)
+    manager.add_campaign({'campaign_id': 'new-1', 'name': 'New'})
+    manager.update_campaign('new-1', {'notes': 'edited'})
+    manager.update_campaign('00000002', {'status': 'pending', 'notes': 'first'})
+    manager.update_campaign('00000002', {'notes': 'second'})
+    expected = snapshot(manager)
+
+    records, _ = manager.journal.read()
+    base = manager._read_csv()
+    once = manager._replay_journal(base.copy(), records)
+    twice = manager._replay_journal(once.copy(), records)
+    assert len(once) == len(twice) == 21, (len(once), len(twice))
+    assert once.equals(twice), "replaying the journal twice changed the result"
+
+    manager.compact()
+    assert snapshot(manager) == expected, "compaction changed the data"
+    manager.close()
+    assert snapshot(deskagent.CampaignManager()) == expected, "reopened data differs"
+
+
+def check_torn_journal_tail(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager(journaled=True, compact_threshold=10 ** 6)
+    manager.update_campaign('00000001', {'notes': 'kept'})
+    # "Crash" mid-append: the manager is abandoned and the last line is cut off
+    with open(deskagent.JOURNAL_PATH, 'a', encoding='utf-8') as f:
+        f.write('{"op": "update", "campaign_id": "00000003", "upd')
+
+    reopened = deskagent.CampaignManager(journaled=True)
+    assert deskagent.JOURNAL_PATH.read_bytes().endswith(b"\n"), "torn line not dropped"
+    assert reopened.journal.count == 1, reopened.journal.count
+    assert reopened.get_campaign('00000001')['notes'] == 'kept'
+    assert reopened.get_campaign('00000003')['notes'] is None
+    reopened.close()
+
+
+def check_crash_between_rename_and_discard(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager(journaled=True, compact_threshold=10 ** 6)
+    manager.add_campaign({'campaign_id': 'new-1', 'name': 'New'})
+    manager.update_campaign('00000004', {'notes': 'after rename'})
+    expected = snapshot(manager)
+
+    def crash(offset):
+        raise KeyboardInterrupt("crash after rename")
+    manager.journal.discard_before = crash
+    try:
+        manager.compact()
+    except KeyboardInterrupt:
+        pass
+
+    # The new snapshot is in place and the journal still holds its records
+    reopened = deskagent.CampaignManager(journaled=True)
+    assert reopened.journal.count == 2, reopened.journal.count
+    assert snapshot(reopened) == expected, "replaying folded records changed the data"
+    reopened.close()
+    assert snapshot(deskagent.CampaignManager()) == expected
+
+
+def check_append_path(directory):
+    # The shipped sheet's header: extra columns, no notes/hash columns
+    header = [col for col in deskagent.CAMPAIGN_COLUMNS
+              if col != 'notes' and not col.endswith('_hash')]
+    header[header.index('donation_type'):0] = ['campaign_image', 'tags']
+    fresh_sheet(directory).reindex(columns=header).to_csv(deskagent.CSV_PATH, index=False)
+
+    manager = deskagent.CampaignManager()
+    inode = deskagent.CSV_PATH.stat().st_ino
+    assert manager.add_campaign({'campaign_id': 'q-1', 'title': 'Comma, "quote"\nnewline',
+                                 'tags': 'a;b'})
+    assert not manager.add_campaign({'campaign_id': 'q-1'}), "duplicate accepted"
+    assert not manager.add_campaign({'campaign_id': '00000005'}), "duplicate accepted"
+    assert deskagent.CSV_PATH.stat().st_ino == inode, "append rewrote the file"
+
+    row = deskagent.CampaignManager().get_campaign('q-1')
+    assert row['title'] == 'Comma, "quote"\nnewline' and row['tags'] == 'a;b', dict(row)
+
+    # A column the sheet lacks forces a rewrite with the new header
+    assert manager.add_campaign({'campaign_id': 'q-2', 'notes': 'new column'})
+    df = deskagent.CampaignManager().load_campaigns()
+    assert len(df) == 22 and df.set_index('campaign_id').loc['q-2', 'notes'] == 'new column'
+
+
+def check_id_allocator(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager()
+    start = datetime.now() - timedelta(seconds=1)
+    ids = []
+    for _ in range(500):
+        data = {'name': 'x'}
+        assert manager.add_campaign(data)
+        ids.append(data['campaign_id'])
+    assert len(set(ids)) == len(ids) and ids == sorted(ids), "IDs not unique and ordered"
+    assert manager.id_allocator.exists('00000007'), "legacy IDs not indexed"
+    assert manager.id_allocator.ids_between(start, datetime.now() + timedelta(seconds=1)) == ids
+    assert deskagent.CampaignIdAllocator.created_at(ids[0]) >= start
+
+    # A restarted allocator continues after every indexed ID
+    reopened = deskagent.CampaignManager()
+    data = {'name': 'y'}
+    assert reopened.add_campaign(data) and data['campaign_id'] > ids[-1]
+
+
+def check_sqlite_sync(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager(backend='sqlite')
+    manager.update_campaign('00000001', {'notes': 'db edit'})
+    manager.store.conn.close()  # crash: no export on exit
+
+    manager = deskagent.CampaignManager(backend='sqlite')
+    assert deskagent.CampaignManager().get_campaign('00000001')['notes'] == 'db edit', \
+        "CSV not brought up to date after a crash"
+    manager.close()
+
+    csv_manager = deskagent.CampaignManager()
+    csv_manager.update_campaign('00000002', {'notes': 'outside edit'})
+    manager = deskagent.CampaignManager(backend='sqlite')
+    assert manager.get_campaign('00000002')['notes'] == 'outside edit', "outside edit ignored"
+    manager.close()
+    assert not list(Path(directory).glob('*.conflict-*')), "unexpected conflict file"
+
+
+def check_locked_sheet(directory):
+    fresh_sheet(directory)
+    manager = deskagent.CampaignManager(journaled=True, compact_threshold=5)
+    attempts = []
+    replace = deskagent.os.replace
+
+    def locked(src, dst):
+        # The sheet is open in Excel (Windows): renaming over it fails
+        if Path(dst) == deskagent.CSV_PATH:
+            attempts.append(src)
+            raise PermissionError("file is in use")
+        return replace(src, dst)
+    deskagent.os.replace = locked
+    try:
+        for n in range(12):
+            manager.update_campaign('00000001', {'notes': f'edit {n}'})
+            if manager._compactor:
+                manager._compactor.join()
+        assert not manager.save_campaigns(manager.load_campaigns())
+    finally:
+        deskagent.os.replace = replace
+
+    assert not list(Path(directory).glob('*.tmp')), "temp files left behind"
+    assert len(attempts) == 3, f"{len(attempts)} rewrites for 12 appends and a save"
+    assert manager.journal.count == 12
+    assert deskagent.CampaignManager(journaled=True).get_campaign('00000001')['notes'] == 'edit 11'
+
+    # Once the sheet is free again the next due compaction folds everything in
+    for n in range(3):
+        manager.update_campaign('00000002', {'notes': f'unlocked {n}'})
+    manager._compactor.join()
+    assert manager.journal.count == 0, manager.journal.count
+    assert deskagent.CampaignManager().get_campaign('00000002')['notes'] == 'unlocked 2'
+
+
+class FakeAutomator:
+    """Stands in for WhydonateAutomator: every submission succeeds unless told to crash"""
+
+    pool = None
+
+    def __init__(self, crash_at=None):
+        self.calls = []
+        self.crash_at = crash_at
+
+    def create_campaign(self, campaign_data, pool=None):
+        self.calls.append(campaign_data['title'])
+        if len(self.calls) == self.crash_at:
+            raise KeyboardInterrupt("crash mid-submission")
+        return True, f"https://example.org/fundraiser/{campaign_data['title']}"
+
+
+def check_batch_resume(directory):
+    fresh_sheet(directory, whydonate_url=None, status='pending')
+    manager = deskagent.CampaignManager()
+    jobs = [(cid, {'title': cid}) for cid in manager.pending_campaigns()['campaign_id']]
+
+    def run(automator):
+        creator = deskagent.ParallelCampaignCreator(automator, max_threads=1)
+        try:
+            return deskagent.BatchRunner(deskagent.CampaignManager()).run(jobs, creator)
+        except KeyboardInterrupt:
+            return None
+
+    first = FakeAutomator(crash_at=4)
+    assert run(first) is None
+    unconfirmed = jobs[3][0]
+
+    second = FakeAutomator()
+    summary = run(second)
+    assert summary['unconfirmed'] == [unconfirmed], summary['unconfirmed']
+    assert summary['skipped'] == 4, summary['skipped']
+    assert not set(first.calls) & set(second.calls), "campaign submitted twice"
+
+    df = deskagent.CampaignManager().load_campaigns().set_index('campaign_id')
+    assert df.loc[unconfirmed, 'status'] == deskagent.BatchRunner.UNCONFIRMED
+    assert df['whydonate_url'].notna().sum() == len(jobs) - 1
+    assert deskagent.BATCH_CHECKPOINT_PATH.read_text() == "", "checkpoint not cleared"
+
+    third = FakeAutomator()
+    assert run(third)['total'] == 0 and not third.calls, "finished campaigns resubmitted"
+
+
+CHECKS = [
+    check_replay_is_idempotent,
+    check_torn_journal_tail,
+    check_crash_between_rename_and_discard,
+    check_append_path,
+    check_id_allocator,
+    check_sqlite_sync,
+    check_locked_sheet,
+    check_batch_resume,
+]
+
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        with tempfile.TemporaryDirectory(prefix="deskagent_check_") as tmp:
+            try:
+                check(Path(tmp))
+                print(f"✅ {check.__name__}")
+            except Exception:
+                failed += 1
+                print(f"❌ {check.__name__}")
+                traceback.print_exc()
+
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())